@@ -1,4 +1,5 @@
 import sys
+from collections import deque  # Cola doble: extracción O(1) por ambos extremos
 
 # Clase que representa un nodo en el árbol de búsqueda
 class Node():
@@ -10,24 +11,32 @@ class Node():
 # Clase para manejar la frontera usando una pila (LIFO) - Usada en DFS
 class StackFrontier():
     def __init__(self):
-        self.frontier = []  # Lista que representa la frontera de nodos
+        self.frontier = deque()  # Deque que representa la frontera de nodos (extracción O(1))
+        self.states = {}  # Estados presentes en la frontera (con su número de apariciones)
 
     def add(self, node):
         self.frontier.append(node)  # Agregar un nodo a la frontera
+        self.states[node.state] = self.states.get(node.state, 0) + 1  # Registrar su estado
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)  # Verificar si la frontera contiene el estado dado
+        return state in self.states  # Verificar en O(1) si la frontera contiene el estado dado
 
     def empty(self):
         return len(self.frontier) == 0  # Verificar si la frontera está vacía
 
+    def _forget(self, node):
+        count = self.states[node.state] - 1  # Descontar una aparición del estado del nodo removido
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]  # El estado ya no está en la frontera
+        return node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")  # Si la frontera está vacía, lanzar una excepción
         else:
-            node = self.frontier[-1]  # Tomar el último nodo de la frontera (LIFO)
-            self.frontier = self.frontier[:-1]  # Eliminar el último nodo de la frontera
-            return node  # Retornar el nodo removido
+            return self._forget(self.frontier.pop())  # Tomar y eliminar el último nodo de la frontera (LIFO)
 
 # Clase para manejar la frontera usando una cola (FIFO) - Usada en BFS
 class QueueFrontier(StackFrontier):
@@ -35,9 +44,7 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")  # Si la frontera está vacía, lanzar una excepción
         else:
-            node = self.frontier[0]  # Tomar el primer nodo de la frontera (FIFO)
-            self.frontier = self.frontier[1:]  # Eliminar el primer nodo de la frontera
-            return node  # Retornar el nodo removido
+            return self._forget(self.frontier.popleft())  # Tomar y eliminar el primer nodo de la frontera (FIFO)
 
 # Clase que representa el laberinto
 class Maze():
@@ -201,18 +208,30 @@ class Maze():
 
         # Guardar la imagen
         img.save(filename)
-if len(sys.argv) != 2:
-    sys.exit("Usage: python mazecomentado.py maze.txt")
-    
-    #exploit para correr todo el programa
-
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
 
+def main(argv=None):
+    """Command line entry point: loads, solves and shows a maze.
+
+    With --no-image the solution is not drawn to maze.png, so PIL is never imported.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    draw = "--no-image" not in args
+    args = [arg for arg in args if arg != "--no-image"]
+    if len(args) != 1:
+        sys.exit("Usage: python mazecomentado.py [--no-image] maze.txt")
+
+    # exploit para correr todo el programa
+    m = Maze(args[0])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve()
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    if draw:
+        m.output_image("maze.png", show_explored=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import sys
+from collections import deque
 
 class Node():
     def __init__(self, state, parent, action):
@@ -9,24 +10,32 @@ class Node():
 
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def _forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+            return self._forget(self.frontier.pop())
 
 
 class QueueFrontier(StackFrontier):
@@ -35,9 +44,7 @@ class QueueFrontier(StackFrontier):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+            return self._forget(self.frontier.popleft())
 
 class Maze():
 
@@ -216,15 +223,28 @@ class Maze():
         img.save(filename)
 
 
-if len(sys.argv) != 2:
-    sys.exit("Usage: python maze.py maze.txt")
+def main(argv=None):
+    """Command line entry point: loads, solves and shows a maze.
+
+    With --no-image the solution is not drawn to maze.png, so PIL is never imported.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    draw = "--no-image" not in args
+    args = [arg for arg in args if arg != "--no-image"]
+    if len(args) != 1:
+        sys.exit("Usage: python maze.py [--no-image] maze.txt")
+
+    m = Maze(args[0])
+    print("Maze:")
+    m.print()
+    print("Solving...")
+    m.solve()
+    print("States Explored:", m.num_explored)
+    print("Solution:")
+    m.print()
+    if draw:
+        m.output_image("maze.png", show_explored=True)
+
 
-m = Maze(sys.argv[1])
-print("Maze:")
-m.print()
-print("Solving...")
-m.solve()
-print("States Explored:", m.num_explored)
-print("Solution:")
-m.print()
-m.output_image("maze.png", show_explored=True)
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Regression benchmark for punto5.Maze.solve_a_star.
+
+Usage: python maze_astar_bench.py [maze.txt ...]   (default: maze.txt maze2.txt)
+
+Runs the previous A* (heap ordered by Node.__lt__, which measured the
+heuristic against the other node instead of the goal, and no best-g check)
+next to the current one and BFS, and prints explored states and path length.
+"""
+import heapq
+import sys
+import time
+
+from punto5 import Maze, Node
+
+
+class LegacyNode(Node):
+    """Node with the ordering solve_a_star used before the fix."""
+    def __lt__(self, other):
+        return self.total_cost(other.state) < other.total_cost(self.state)
+
+
+def legacy_a_star(maze):
+    """The previous solve_a_star loop, kept only as a baseline."""
+    maze.num_explored = 0
+    frontier = [LegacyNode(state=maze.start, parent=None, action=None, cost=0)]
+    explored = set()
+    while frontier:
+        node = heapq.heappop(frontier)
+        maze.num_explored += 1
+        if node.state == maze.goal:
+            cells = []
+            while node.parent is not None:
+                cells.append(node.state)
+                node = node.parent
+            return cells
+        explored.add(node.state)
+        for action, state in maze.neighbors(node.state):
+            if state not in explored:
+                heapq.heappush(frontier, LegacyNode(state=state, parent=node, action=action, cost=node.cost + 1))
+    raise Exception("no solution")
+
+
+def run(label, filename, solve):
+    maze = Maze(filename)
+    started = time.perf_counter()
+    length = solve(maze)
+    elapsed = time.perf_counter() - started
+    print(f"{filename:>12} {label:>10} {maze.num_explored:>9} {length:>6} {elapsed * 1000:9.2f} ms")
+
+
+def main():
+    filenames = sys.argv[1:] or ["maze.txt", "maze2.txt"]
+    print(f"{'maze':>12} {'solver':>10} {'explored':>9} {'path':>6} {'time':>12}")
+    for filename in filenames:
+        run("a* before", filename, lambda m: len(legacy_a_star(m)))
+        run("a* after", filename, lambda m: (m.solve_a_star(), len(m.solution[1]))[1])
+        run("bfs", filename, lambda m: (m.solve_bfs(), len(m.solution[1]))[1])
+
+
+if __name__ == "__main__":
+    main()
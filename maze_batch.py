@@ -0,0 +1,96 @@
+"""Solves many maze files in parallel and streams one JSON line per maze.
+
+Usage: python maze_batch.py [--algorithm a_star] [--workers N] [--chunksize K]
+                            [--cache DIR] path_or_glob ...
+
+`--algorithm` names any Maze.solve_* method without the prefix (bfs, dfs, a_star,
+bidirectional, jps, reduced, wavefront, bitboard, ...). Files ending in .mzb are
+loaded with Maze.load_binary, anything else as text with compact walls.
+With --cache, text mazes are solved through a maze_cache.SolutionCache in DIR
+shared by all workers; records then say whether the result was a cache hit.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from maze_cache import SolutionCache
+from punto5 import Maze
+
+
+def load(filename):
+    if filename.endswith(".mzb"):
+        return Maze.load_binary(filename)
+    return Maze(filename, compact=True)
+
+
+def solve_file(task):
+    """Worker: loads and solves one maze, returning its result record (never raises)."""
+    filename, algorithm, cache = task
+    record = {"file": filename, "algorithm": algorithm, "status": "ok"}
+    started = time.perf_counter()
+    try:
+        if cache is not None and not filename.endswith(".mzb"):
+            return solve_cached(record, SolutionCache(cache), started)
+        maze = load(filename)
+        record["load_s"] = round(time.perf_counter() - started, 6)
+        started = time.perf_counter()
+        try:
+            getattr(maze, "solve_" + algorithm)()
+            record["path_length"] = len(maze.solution[1])
+        finally:
+            record["solve_s"] = round(time.perf_counter() - started, 6)
+            record["num_explored"] = getattr(maze, "num_explored", None)
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = str(e)
+    return record
+
+
+def solve_cached(record, cache, started):
+    result = cache.solve_file(record["file"], record["algorithm"])
+    record["solve_s"] = round(time.perf_counter() - started, 6)
+    record["cache_hit"] = result.hit
+    record["num_explored"] = result.num_explored
+    if result.solution is None:
+        record["status"] = "error"
+        record["error"] = "no solution"
+    else:
+        record["path_length"] = len(result.solution[1])
+    return record
+
+
+def expand(patterns):
+    """Expands globs (files that do not match any glob are kept as given), without duplicates."""
+    seen = set()
+    for pattern in patterns:
+        for filename in sorted(glob.glob(pattern, recursive=True)) or [pattern]:
+            if filename not in seen:
+                seen.add(filename)
+                yield filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve many maze files in parallel.")
+    parser.add_argument("paths", nargs="+", help="maze files or glob patterns")
+    parser.add_argument("--algorithm", default="a_star", help="Maze.solve_<algorithm> to run (default: a_star)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=1, help="mazes sent to a worker at a time")
+    parser.add_argument("--cache", help="directory of an on-disk solution cache")
+    args = parser.parse_args()
+
+    if not callable(getattr(Maze, "solve_" + args.algorithm, None)):
+        sys.exit(f"unknown algorithm: {args.algorithm}")
+
+    tasks = ((filename, args.algorithm, args.cache) for filename in expand(args.paths))
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for record in executor.map(solve_file, tasks, chunksize=args.chunksize):
+            sys.stdout.write(json.dumps(record) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""Benchmark suite for the punto5.Maze solvers over a seeded synthetic corpus.
+
+Usage: python maze_bench.py [--sizes 32,64,...] [--kinds perfect,rooms,unreachable]
+                            [--solvers solve_dfs,solve_bfs,solve_a_star] [--seed 0]
+                            [--timeout 600] [--corpus DIR] [--output results.jsonl|results.csv]
+
+Each (maze, solver) pair runs in a fresh process so that peak RSS belongs to that
+run alone. One record per run is printed as a JSON line and, with --output, saved
+as JSON lines or CSV (by extension) together with the current git commit.
+"""
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+import resource
+import subprocess
+import tempfile
+import time
+
+from maze_generator import generate, write_text
+
+SIZES = [32, 64, 128, 256, 512, 1024, 2048, 4096]
+KINDS = ["perfect", "rooms", "unreachable"]
+SOLVERS = ["solve_dfs", "solve_bfs", "solve_a_star"]
+STATS = ["pushes", "pops", "stale_pops", "max_frontier", "max_explored", "neighbor_calls"]
+FIELDS = ["commit", "kind", "size", "seed", "solver", "status", "load_s", "solve_s", "path_s",
+          "num_explored", *STATS, "path_length", "peak_rss_kb"]
+
+
+def corpus_file(directory, kind, size, seed):
+    """Writes (once) and returns the path of one corpus maze."""
+    filename = os.path.join(directory, f"{kind}-{size}-{seed}.txt")
+    if not os.path.exists(filename):
+        if kind == "perfect":
+            flags, start, goal = generate(size, algorithm="backtracker", seed=seed)
+        else:
+            flags, start, goal = generate(size, algorithm="rooms", seed=seed, density=0.1)
+        if kind == "unreachable":
+            # Pared completa que deja la esquina de la meta aislada del inicio
+            for i in range(size):
+                flags[i * size + size - 3] = 1
+        write_text(filename + ".tmp", flags, size, size, start, goal)
+        os.replace(filename + ".tmp", filename)
+    return filename
+
+
+def run_solver(filename, solver, connection):
+    """Child process body: loads the maze, runs one solver and sends back its metrics."""
+    from punto5 import Maze
+    started = time.perf_counter()
+    maze = Maze(filename, compact=True)
+    load = time.perf_counter() - started
+    record = {"load_s": round(load, 6), "status": "ok"}
+    started = time.perf_counter()
+    try:
+        getattr(maze, solver)()
+    except Exception as e:
+        record["status"] = str(e)
+    record["solve_s"] = round(time.perf_counter() - started, 6)
+    record["num_explored"] = getattr(maze, "num_explored", None)
+    record["path_s"] = round(maze.stats.wall_time.get("path", 0.0), 6)
+    for field in STATS:
+        record[field] = getattr(maze.stats, field)
+    record["path_length"] = len(maze.solution[1]) if maze.solution is not None else None
+    record["peak_rss_kb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    connection.send(record)
+
+
+def measure(filename, solver, timeout):
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=run_solver, args=(filename, solver, sender))
+    process.start()
+    sender.close()
+    if receiver.poll(timeout):
+        record = receiver.recv()
+    else:
+        record = {"status": "timeout"}
+    process.join(1)
+    if process.is_alive():
+        process.terminate()
+        process.join()
+    elif "solve_s" not in record and process.exitcode:
+        record = {"status": f"crashed ({process.exitcode})"}
+    return record
+
+
+def current_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def save(records, filename):
+    with open(filename, "w", newline="") as f:
+        if filename.endswith(".csv"):
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(records)
+        else:
+            for record in records:
+                f.write(json.dumps(record) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark maze solvers over a synthetic corpus.")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--kinds", default=",".join(KINDS))
+    parser.add_argument("--solvers", default=",".join(SOLVERS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=600, help="seconds per run")
+    parser.add_argument("--corpus", help="directory where generated mazes are kept (default: temporary)")
+    parser.add_argument("--output", help="results file, .csv or JSON lines")
+    args = parser.parse_args()
+
+    commit = current_commit()
+    records = []
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.corpus or tmp
+        os.makedirs(directory, exist_ok=True)
+        for size in map(int, args.sizes.split(",")):
+            for kind in args.kinds.split(","):
+                filename = corpus_file(directory, kind, size, args.seed)
+                for solver in args.solvers.split(","):
+                    record = {"commit": commit, "kind": kind, "size": size, "seed": args.seed, "solver": solver}
+                    record.update(measure(filename, solver, args.timeout))
+                    records.append({field: record.get(field) for field in FIELDS})
+                    print(json.dumps(records[-1]), flush=True)
+    if args.output:
+        save(records, args.output)
+
+
+if __name__ == "__main__":
+    main()
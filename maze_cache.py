@@ -0,0 +1,223 @@
+"""Content-addressed on-disk cache of maze solutions.
+
+Entries are keyed by a SHA-256 of the normalized wall grid (the packed BitGrid
+rows), the terrain costs if any, the size, start, goal and algorithm, so
+equivalent mazes share one entry whatever their file name or wall characters. Each entry stores the moves of the
+solution (the cells follow from the start), `num_explored`, and optionally the
+explored cells as a bitmask, all zlib-compressed.
+
+`SolutionCache.solve_file` also remembers the hash of the raw file bytes, so a
+hit for a file already seen skips parsing and building the Maze altogether.
+
+Writes go to a temporary file and are published with os.replace under an
+flock, which also guards a running total of the cache size kept in `.size`.
+The directory is only scanned when that total passes `max_bytes`; eviction then
+deletes least recently used entries down to `EVICT_TO` of the limit, so several
+processes can share one cache directory without rescanning it on every write.
+"""
+import fcntl
+import hashlib
+import os
+import struct
+import tempfile
+import time
+import zlib
+
+from punto5 import ACTIONS, MOVES, BitGrid, CellSet, Maze
+
+ENTRY_MAGIC = b"MSOL"
+ENTRY_VERSION = 1
+ENTRY_HEADER = struct.Struct("<4sBIIiiqi")
+EVICT_TO = 0.9  # Fracción de max_bytes que queda tras una limpieza
+
+
+class CachedSolution():
+    """What a cache lookup returns; `solution` is None when the maze has no solution."""
+    def __init__(self, solution, num_explored, explored=None, hit=False):
+        self.solution = solution
+        self.num_explored = num_explored
+        self.explored = explored
+        self.hit = hit
+
+
+class SolutionCache():
+    def __init__(self, directory, max_bytes=256 * 2 ** 20):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, maze, algorithm):
+        """Content key of a maze and algorithm."""
+        walls = maze.walls
+        if not isinstance(walls, BitGrid):
+            walls = BitGrid.from_flags(maze.wall_flags(), maze.height, maze.width)
+        digest = hashlib.sha256()
+        digest.update(f"{algorithm} {maze.height} {maze.width} {maze.start} {maze.goal}\n".encode())
+        digest.update(walls.bits)
+        if maze.costs is not None:
+            digest.update(maze.costs)
+        return digest.hexdigest()
+
+    def get(self, maze, algorithm):
+        """Returns the CachedSolution stored for `maze`, or None."""
+        return self._read(self.key(maze, algorithm))
+
+    def put(self, maze, algorithm, store_explored=False):
+        """Stores the result of the last `solve_<algorithm>` run on `maze` and returns its key.
+
+        Call it after the solver, also when it raised "no solution".
+        """
+        key = self.key(maze, algorithm)
+        actions = bytes(ACTIONS.index(action) for action in maze.solution[0]) if maze.solution else b""
+        explored = b""
+        if store_explored:
+            flags = bytearray(maze.height * maze.width)
+            for i, j in maze.explored:
+                flags[i * maze.width + j] = 1
+            explored = BitGrid.from_flags(flags, maze.height, maze.width).bits
+        header = ENTRY_HEADER.pack(ENTRY_MAGIC, ENTRY_VERSION, maze.height, maze.width, *maze.start,
+                                   maze.num_explored, len(actions) if maze.solution else -1)
+        self._write(key + ".sol", zlib.compress(header + actions + explored))
+        return key
+
+    def solve_file(self, filename, algorithm, store_explored=False):
+        """Solves a text maze file through the cache.
+
+        The raw bytes of the file are hashed first; when they were seen before, the
+        entry is read without parsing the maze. Otherwise the maze is built, looked up
+        by content, and solved and stored on a miss.
+        """
+        with open(filename, "rb") as f:
+            alias = hashlib.sha256(f.read()).hexdigest() + "-" + algorithm + ".ref"
+        try:
+            with open(os.path.join(self.directory, alias)) as f:
+                cached = self._read(f.read().strip())
+            if cached is not None:
+                self._touch(alias)
+                return cached
+        except FileNotFoundError:
+            pass
+
+        maze = Maze(filename, compact=True)
+        key = self.key(maze, algorithm)
+        cached = self._read(key)
+        if cached is None:
+            try:
+                getattr(maze, "solve_" + algorithm)()
+            except Exception as e:
+                if str(e) != "no solution":
+                    raise
+            self.put(maze, algorithm, store_explored)
+            cached = CachedSolution(maze.solution, maze.num_explored, maze.explored if store_explored else None)
+        self._write(alias, key.encode())
+        return cached
+
+    def _read(self, key):
+        path = os.path.join(self.directory, key + ".sol")
+        try:
+            with open(path, "rb") as f:
+                data = zlib.decompress(f.read())
+            magic, version, height, width, start_row, start_col, num_explored, length = \
+                ENTRY_HEADER.unpack_from(data)
+        except (FileNotFoundError, zlib.error, struct.error):
+            return None
+        if magic != ENTRY_MAGIC or version != ENTRY_VERSION or length > len(data) - ENTRY_HEADER.size:
+            return None
+        self._touch(key + ".sol")
+
+        solution = None
+        offset = ENTRY_HEADER.size
+        if length >= 0:
+            actions = []
+            cells = []
+            r, c = start_row, start_col
+            for move in data[offset:offset + length]:
+                if move >= len(ACTIONS):
+                    return None
+                dr, dc = MOVES[ACTIONS[move]]
+                r, c = r + dr, c + dc
+                actions.append(ACTIONS[move])
+                cells.append((r, c))
+            solution = (actions, cells)
+            offset += length
+        explored = None
+        if len(data) > offset:
+            grid = BitGrid(height, width, bytearray(data[offset:]))
+            explored = CellSet(grid.unpacked(), width, 1)
+        return CachedSolution(solution, num_explored, explored, hit=True)
+
+    def _touch(self, name):
+        # La fecha de modificación marca el último uso para la política LRU
+        try:
+            os.utime(os.path.join(self.directory, name))
+        except FileNotFoundError:
+            pass
+
+    def _write(self, name, data):
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        path = os.path.join(self.directory, name)
+        with self._lock():
+            try:
+                replaced = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp, path)
+            total = self._total()
+            total = total + len(data) - replaced if total is not None else self._scan()[1]
+            if total > self.max_bytes:
+                total = self._evict()
+            self._save_total(total)
+
+    def _lock(self):
+        """Opens the lock file holding an exclusive flock; closing it releases the lock."""
+        lock = open(os.path.join(self.directory, ".lock"), "w")
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return lock
+
+    def _total(self):
+        """Returns the size recorded in `.size`, or None when it is missing or unreadable."""
+        try:
+            with open(os.path.join(self.directory, ".size")) as f:
+                return int(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _save_total(self, total):
+        with open(os.path.join(self.directory, ".size"), "w") as f:
+            f.write(str(total))
+
+    def _scan(self):
+        """Returns ([(mtime, size, path)] of the entries, their total size), deleting stale temporary files."""
+        entries = []
+        total = 0
+        for entry in os.scandir(self.directory):
+            try:
+                if entry.name.endswith((".sol", ".ref")):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                    total += stat.st_size
+                elif entry.name.endswith(".tmp") and time.time() - entry.stat().st_mtime > 3600:
+                    os.remove(entry.path)  # Restos de escrituras interrumpidas
+            except FileNotFoundError:
+                # Otro proceso lo publicó o lo borró mientras se recorría el directorio
+                continue
+        return entries, total
+
+    def _evict(self):
+        """Deletes least recently used entries until the cache fits in EVICT_TO of `max_bytes`.
+
+        Called with the lock held; returns the new total size.
+        """
+        entries, total = self._scan()
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes * EVICT_TO:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+        return total
@@ -0,0 +1,30 @@
+"""Converts mazes between the text format and the packed binary format.
+
+Usage: python maze_convert.py input output
+
+Files ending in .mzb are read and written in the binary format
+(see punto5.Maze.save_binary); anything else is treated as text.
+"""
+import sys
+
+from punto5 import Maze
+
+
+def load(filename):
+    if filename.endswith(".mzb"):
+        return Maze.load_binary(filename)
+    return Maze(filename, compact=True, strict=False)
+
+
+def main():
+    if len(sys.argv) != 3:
+        sys.exit("Usage: python maze_convert.py input output")
+    maze = load(sys.argv[1])
+    if sys.argv[2].endswith(".mzb"):
+        maze.save_binary(sys.argv[2])
+    else:
+        maze.save_text(sys.argv[2])
+
+
+if __name__ == "__main__":
+    main()
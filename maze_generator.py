@@ -0,0 +1,172 @@
+"""Seeded maze generator for large test inputs.
+
+Usage: python maze_generator.py height [width] [--algorithm backtracker|kruskal|rooms]
+                                [--density 0.2] [--seed 0] [--output maze.txt|maze.mzb]
+
+Every generator works on a flat bytearray of walls (1 = wall) indexed by
+`i * width + j`, runs in time linear in the number of cells and uses no
+recursion. `generate` returns that array together with start and goal;
+`write_text` turns it into a file that `punto5.Maze` reads, and
+`punto5.Maze.from_flags` builds the compact in-memory maze directly.
+"""
+import argparse
+import random
+import sys
+from array import array
+
+from punto5 import Maze, TEXT_CELLS
+
+
+def backtracker(height, width, rng):
+    """Perfect maze carved by an iterative randomized depth-first search (recursive backtracker).
+
+    Maze cells sit at odd coordinates; the walls between them are knocked down as the
+    search moves. Long, winding corridors with few dead ends.
+    """
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+    flags = bytearray(b"\x01") * (height * width)
+    if rows <= 0 or cols <= 0:
+        return flags
+    visited = bytearray(rows * cols)
+    random = rng.random
+    stack = [0]
+    visited[0] = 1
+    flags[width + 1] = 0
+    while stack:
+        cell = stack[-1]
+        r, c = divmod(cell, cols)
+        options = []
+        if r > 0 and not visited[cell - cols]:
+            options.append(cell - cols)
+        if r < rows - 1 and not visited[cell + cols]:
+            options.append(cell + cols)
+        if c > 0 and not visited[cell - 1]:
+            options.append(cell - 1)
+        if c < cols - 1 and not visited[cell + 1]:
+            options.append(cell + 1)
+        if not options:
+            stack.pop()
+            continue
+        chosen = options[int(random() * len(options))]
+        visited[chosen] = 1
+        nr, nc = divmod(chosen, cols)
+        flags[(r + nr + 1) * width + c + nc + 1] = 0
+        flags[(2 * nr + 1) * width + 2 * nc + 1] = 0
+        stack.append(chosen)
+    return flags
+
+
+def kruskal(height, width, rng):
+    """Perfect maze from randomized Kruskal: walls between cells are removed in random
+    order whenever they separate two different sets (union-find with path halving).
+
+    Many short dead ends and a more uniform texture than the backtracker.
+    """
+    rows, cols = (height - 1) // 2, (width - 1) // 2
+    flags = bytearray(b"\x01") * (height * width)
+    if rows <= 0 or cols <= 0:
+        return flags
+    cells = rows * cols
+    for cell in range(cells):
+        r, c = divmod(cell, cols)
+        flags[(2 * r + 1) * width + 2 * c + 1] = 0
+
+    # Arista = celda * 2 + dirección (0 derecha, 1 abajo)
+    edges = array("i", (cell * 2 + d for cell in range(cells) for d in (0, 1)
+                        if (d == 0 and cell % cols < cols - 1) or (d == 1 and cell < cells - cols)))
+    rng.shuffle(edges)
+    parent = array("i", range(cells))
+
+    def find(cell):
+        while parent[cell] != cell:
+            parent[cell] = parent[parent[cell]]
+            cell = parent[cell]
+        return cell
+
+    remaining = cells - 1
+    for edge in edges:
+        if not remaining:
+            break
+        a = edge >> 1
+        b = a + 1 if edge & 1 == 0 else a + cols
+        root_a, root_b = find(a), find(b)
+        if root_a == root_b:
+            continue
+        parent[root_a] = root_b
+        remaining -= 1
+        r, c = divmod(a, cols)
+        flags[(2 * r + 1 + (edge & 1)) * width + 2 * c + 1 + (1 - (edge & 1))] = 0
+    return flags
+
+
+def rooms(height, width, rng, density=0.2):
+    """Open floor where each cell is a wall with probability `density`."""
+    cutoff = int(256 * density)
+    table = bytes(1 if b < cutoff else 0 for b in range(256))
+    return bytearray(rng.randbytes(height * width).translate(table))
+
+
+ALGORITHMS = {"backtracker": backtracker, "kruskal": kruskal, "rooms": rooms}
+
+
+def generate(height, width=None, algorithm="backtracker", seed=None, density=0.2):
+    """Returns (flags, start, goal) for a new maze of the given size.
+
+    Perfect mazes start at (1, 1) and end at the last odd cell, so they need at least
+    two cells at odd coordinates (3x5 or 5x3); open rooms use the opposite corners, which are cleared
+    together with their neighbors.
+    """
+    width = height if width is None else width
+    rng = random.Random(seed)
+    if algorithm == "rooms":
+        if height < 1 or width < 1 or height * width < 2:
+            raise Exception("rooms need at least two cells")
+        flags = rooms(height, width, rng, density)
+        start, goal = (0, 0), (height - 1, width - 1)
+        for r, c in ((0, 0), (0, 1), (1, 0), (height - 1, width - 1), (height - 1, width - 2), (height - 2, width - 1)):
+            if 0 <= r < height and 0 <= c < width:
+                flags[r * width + c] = 0
+    elif algorithm in ALGORITHMS:
+        # Las celdas del laberinto están en coordenadas impares: inicio y meta necesitan dos distintas
+        if ((height - 1) // 2) * ((width - 1) // 2) < 2:
+            raise Exception(f"{algorithm} mazes need at least 3x5 or 5x3 cells")
+        flags = ALGORITHMS[algorithm](height, width, rng)
+        start = (1, 1)
+        goal = (2 * ((height - 1) // 2) - 1, 2 * ((width - 1) // 2) - 1)
+    else:
+        raise Exception(f"unknown algorithm: {algorithm}")
+    return flags, start, goal
+
+
+def write_text(file, flags, height, width, start, goal):
+    """Writes the maze in the text format read by punto5.Maze to a filename or binary file."""
+    if isinstance(file, str):
+        with open(file, "wb") as f:
+            return write_text(f, flags, height, width, start, goal)
+    cells = flags.translate(TEXT_CELLS)
+    cells[start[0] * width + start[1]] = ord("A")
+    cells[goal[0] * width + goal[1]] = ord("B")
+    for i in range(height):
+        file.write(cells[i * width:(i + 1) * width] + b"\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a seeded maze.")
+    parser.add_argument("height", type=int)
+    parser.add_argument("width", type=int, nargs="?")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="backtracker")
+    parser.add_argument("--density", type=float, default=0.2, help="wall probability for rooms")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", help=".txt (default: stdout) or .mzb for the binary format")
+    args = parser.parse_args()
+
+    width = args.height if args.width is None else args.width
+    flags, start, goal = generate(args.height, width, args.algorithm, args.seed, args.density)
+    if args.output and args.output.endswith(".mzb"):
+        Maze.from_flags(flags, args.height, width, start, goal).save_binary(args.output)
+    else:
+        write_text(args.output or sys.stdout.buffer, flags, args.height, width, start, goal)
+
+
+if __name__ == "__main__":
+    main()
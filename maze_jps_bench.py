@@ -0,0 +1,73 @@
+"""Compares punto5.Maze.solve_jps against solve_a_star.
+
+Usage: python maze_jps_bench.py [size ...]   (default sizes: 200 500 1000)
+
+Each size is an open square room with 5 % scattered seeded obstacles, start
+and goal in opposite corners. Heap pushes and pops are counted by swapping a
+counting wrapper in for the heapq module that punto5 uses.
+"""
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+
+import punto5
+from punto5 import Maze
+
+
+class CountingHeapq():
+    def __init__(self):
+        self.pushes = 0
+        self.pops = 0
+
+    def heappush(self, heap, item):
+        self.pushes += 1
+        heapq.heappush(heap, item)
+
+    def heappop(self, heap):
+        self.pops += 1
+        return heapq.heappop(heap)
+
+
+def write_open_room(filename, size, density=0.05, seed=0):
+    rng = random.Random(seed)
+    with open(filename, "w") as f:
+        for i in range(size):
+            row = ["#" if rng.random() < density else " " for _ in range(size)]
+            if i == 0:
+                row[0] = "A"
+            if i == size - 1:
+                row[-1] = "B"
+            f.write("".join(row) + "\n")
+
+
+def run(filename, method):
+    maze = Maze(filename)
+    counter = CountingHeapq()
+    punto5.heapq = counter
+    try:
+        started = time.perf_counter()
+        getattr(maze, method)()
+        elapsed = time.perf_counter() - started
+    finally:
+        punto5.heapq = heapq
+    return counter, maze, elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [200, 500, 1000]
+    print(f"{'size':>6} {'solver':>12} {'pushes':>9} {'pops':>9} {'explored':>9} {'path':>6} {'time':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            filename = os.path.join(tmp, f"room{size}.txt")
+            write_open_room(filename, size)
+            for method in ("solve_a_star", "solve_jps"):
+                counter, maze, elapsed = run(filename, method)
+                print(f"{size:>6} {method:>12} {counter.pushes:>9} {counter.pops:>9} "
+                      f"{maze.num_explored:>9} {len(maze.solution[1]):>6} {elapsed:9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compares the memory used by the two wall representations of punto5.Maze.
+
+Usage: python maze_memory_bench.py [size ...]   (default sizes: 1000 4000 10000)
+
+For every size a seeded random square maze is written to a temporary file and
+loaded twice: once with the default list-of-lists walls and once with the
+bit-packed BitGrid (`Maze(filename, compact=True)`).
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from punto5 import Maze
+
+# Bytes aleatorios -> '#' (30 % aprox.) o ' '
+TEXT_CELLS = bytes(ord("#") if b < 77 else ord(" ") for b in range(256))
+
+
+def write_random_maze(filename, size, seed=0):
+    rng = random.Random(seed)
+    with open(filename, "wb") as f:
+        for i in range(size):
+            row = bytearray(rng.randbytes(size).translate(TEXT_CELLS))
+            if i == 0:
+                row[0] = ord("A")
+            if i == size - 1:
+                row[-1] = ord("B")
+            f.write(row + b"\n")
+
+
+def walls_size(walls):
+    """Retained size in bytes of a walls structure (bools are shared singletons)."""
+    if isinstance(walls, list):
+        return sys.getsizeof(walls) + sum(sys.getsizeof(row) for row in walls)
+    return sys.getsizeof(walls) + sys.getsizeof(walls.bits)
+
+
+def measure(filename, compact):
+    tracemalloc.start()
+    started = time.perf_counter()
+    maze = Maze(filename, compact=compact)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return walls_size(maze.walls), peak, elapsed
+
+
+def mib(n):
+    return f"{n / 2 ** 20:10.1f} MiB"
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 4000, 10000]
+    print(f"{'size':>6} {'backend':>8} {'walls':>14} {'peak load':>14} {'load time':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            filename = os.path.join(tmp, f"maze{size}.txt")
+            write_random_maze(filename, size)
+            for backend, compact in (("lists", False), ("bitgrid", True)):
+                retained, peak, elapsed = measure(filename, compact)
+                print(f"{size:>6} {backend:>8} {mib(retained)} {mib(peak)} {elapsed:9.2f}s")
+            os.remove(filename)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compares replanning with punto5.Maze.solve_incremental (D* Lite) against
+running solve_a_star from scratch after every change.
+
+Usage: python maze_replan_bench.py [--sizes 200,500,1000] [--toggles 200] [--seed 0]
+
+Each size is a seeded open room (20 % walls). The same sequence of random wall
+toggles is applied to two copies of the maze; after every toggle one copy is
+repaired incrementally and the other solved again with A*. Both must agree on
+the path length.
+"""
+import argparse
+import random
+import time
+
+from maze_generator import generate
+from punto5 import Maze
+
+
+def solve(maze, method):
+    started = time.perf_counter()
+    try:
+        getattr(maze, method)()
+        length = len(maze.solution[1])
+    except Exception as e:
+        if str(e) != "no solution":
+            raise
+        length = None
+    return time.perf_counter() - started, maze.num_explored, length
+
+
+def run(size, toggles, seed):
+    flags, start, goal = generate(size, algorithm="rooms", seed=seed)
+    incremental = Maze.from_flags(flags, size, size, start, goal)
+    full = Maze.from_flags(flags, size, size, start, goal)
+    rng = random.Random(seed)
+
+    initial = solve(incremental, "solve_incremental")[0], solve(full, "solve_a_star")[0]
+    totals = {"solve_incremental": [0.0, 0], "solve_a_star": [0.0, 0]}
+    for _ in range(toggles):
+        cell = (rng.randrange(size), rng.randrange(size))
+        if cell in (start, goal):
+            continue
+        wall = not incremental.walls[cell[0]][cell[1]]
+        incremental.set_wall(cell, wall)
+        full.set_wall(cell, wall)
+        lengths = []
+        for maze, method in ((incremental, "solve_incremental"), (full, "solve_a_star")):
+            elapsed, explored, length = solve(maze, method)
+            totals[method][0] += elapsed
+            totals[method][1] += explored
+            lengths.append(length)
+        if lengths[0] != lengths[1]:
+            raise Exception(f"path lengths differ after toggling {cell}: {lengths}")
+    return initial, totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark D* Lite replanning against full A*.")
+    parser.add_argument("--sizes", default="200,500,1000")
+    parser.add_argument("--toggles", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>6} {'solver':>18} {'first':>9} {'per toggle':>11} {'explored/toggle':>16}")
+    for size in map(int, args.sizes.split(",")):
+        initial, totals = run(size, args.toggles, args.seed)
+        for first, (method, (elapsed, explored)) in zip(initial, totals.items()):
+            print(f"{size:>6} {method:>18} {first:8.3f}s {elapsed / args.toggles * 1000:9.2f}ms "
+                  f"{explored / args.toggles:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
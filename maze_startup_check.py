@@ -0,0 +1,61 @@
+"""Checks that importing the maze modules and loading a small maze stays cheap.
+
+Usage: python maze_startup_check.py [--budget-ms 50] [--runs 5] [--maze maze.txt]
+
+Each run starts a fresh interpreter that times `import` of the module plus
+loading the maze, and reports whether a heavy optional dependency (PIL, NumPy)
+got imported on the way. The best of `--runs` runs must fit in the budget and no
+heavy dependency may be loaded; otherwise the script exits with status 1.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+MODULES = ["maze", "punto5"]
+HEAVY = ["PIL", "numpy"]
+
+CHILD = """
+import sys, time
+started = time.perf_counter()
+import {module}
+{module}.Maze({maze!r})
+elapsed = time.perf_counter() - started
+print(elapsed * 1000, ",".join(name for name in {heavy!r} if name in sys.modules))
+"""
+
+
+def measure(module, maze, runs):
+    """Returns (best milliseconds, heavy modules imported) over `runs` fresh interpreters."""
+    directory = os.path.dirname(os.path.abspath(__file__))
+    best = None
+    heavy = set()
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, "-c", CHILD.format(module=module, maze=maze, heavy=HEAVY)],
+                                capture_output=True, text=True, cwd=directory, check=True)
+        elapsed, _, loaded = result.stdout.strip().partition(" ")
+        best = float(elapsed) if best is None else min(best, float(elapsed))
+        heavy.update(name for name in loaded.split(",") if name)
+    return best, sorted(heavy)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check import and load time of the maze modules.")
+    parser.add_argument("--budget-ms", type=float, default=50)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--maze", default="maze.txt", help="small maze to load (relative to this script)")
+    args = parser.parse_args()
+
+    failed = False
+    for module in MODULES:
+        elapsed, heavy = measure(module, args.maze, args.runs)
+        ok = elapsed <= args.budget_ms and not heavy
+        failed = failed or not ok
+        print(f"{module:>8} {elapsed:8.2f} ms  {'ok' if ok else 'FAIL'}"
+              + (f"  (imported {', '.join(heavy)})" if heavy else ""))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""Compares Maze.solve_weighted on Dial's bucket queue against the same search on heapq.
+
+Usage: python maze_weighted_bench.py [size ...]   (default size: 2000)
+
+Each size is a seeded open room (20 % walls) whose free cells get random terrain
+costs 1-9. Dijkstra and A* run with both queues and must agree on the cost.
+"""
+import random
+import sys
+import time
+
+from maze_generator import generate
+from punto5 import Maze
+
+# Byte aleatorio -> costo de terreno 1-9
+COSTS = bytes(1 + b % 9 for b in range(256))
+
+
+def weighted_maze(size, seed=0):
+    flags, start, goal = generate(size, algorithm="rooms", seed=seed)
+    costs = random.Random(seed).randbytes(size * size).translate(COSTS)
+    return Maze.from_flags(flags, size, size, start, goal, costs=costs)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [2000]
+    print(f"{'size':>6} {'method':>9} {'queue':>8} {'cost':>8} {'explored':>9} {'pops':>9} {'time':>10}")
+    for size in sizes:
+        maze = weighted_maze(size)
+        for method in ("dijkstra", "a_star"):
+            costs = set()
+            for queue in ("buckets", "heap"):
+                started = time.perf_counter()
+                maze.solve_weighted(method, queue)
+                elapsed = time.perf_counter() - started
+                costs.add(maze.solution_cost)
+                print(f"{size:>6} {method:>9} {queue:>8} {maze.solution_cost:>8} {maze.num_explored:>9} "
+                      f"{maze.stats.pops:>9} {elapsed:9.3f}s")
+            if len(costs) != 1:
+                raise Exception(f"queues disagree on the cost: {costs}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
 import sys
 import heapq  # Para usar la cola de prioridad
+import mmap
+import os
+import re
+import struct
+import time
+from array import array  # Arreglos planos de enteros para la búsqueda sin nodos
+from collections import OrderedDict, deque  # Frontera con extracción O(1) por ambos extremos
+from functools import wraps
+from itertools import chain
 
 class Node():
+    __slots__ = ("state", "parent", "action", "cost")
+
     def __init__(self, state, parent, action, cost=0):
         self.state = state
         self.parent = parent
@@ -16,98 +27,650 @@ class Node():
     def heuristic(self, goal):
         return abs(self.state[0] - goal[0]) + abs(self.state[1] - goal[1])
 
-    # Comparar nodos para la cola de prioridad
-    def __lt__(self, other):
-        return self.total_cost(other.state) < other.total_cost(self.state)
-
 class StackFrontier():
     def __init__(self):
-        self.frontier = []
+        self.frontier = deque()
+        self.states = {}
 
     def add(self, node):
         self.frontier.append(node)
+        self.states[node.state] = self.states.get(node.state, 0) + 1
 
     def contains_state(self, state):
-        return any(node.state == state for node in self.frontier)
+        return state in self.states
 
     def empty(self):
         return len(self.frontier) == 0
 
+    def _forget(self, node):
+        count = self.states[node.state] - 1
+        if count:
+            self.states[node.state] = count
+        else:
+            del self.states[node.state]
+        return node
+
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[-1]
-            self.frontier = self.frontier[:-1]
-            return node
+            return self._forget(self.frontier.pop())
 
 class QueueFrontier(StackFrontier):
     def remove(self):
         if self.empty():
             raise Exception("empty frontier")
         else:
-            node = self.frontier[0]
-            self.frontier = self.frontier[1:]
-            return node
+            return self._forget(self.frontier.popleft())
+
+# Acciones en el orden en que Maze.neighbors genera los vecinos
+ACTIONS = ("up", "down", "left", "right")
+
+# Desplazamiento (fila, columna) de cada acción
+MOVES = {"up": (-1, 0), "down": (1, 0), "left": (0, -1), "right": (0, 1)}
+
+# Acción inversa de cada movimiento (para recorrer los caminos hacia atrás)
+OPPOSITE = {"up": "down", "down": "up", "left": "right", "right": "left"}
+
+# Estados de una celda en la búsqueda con arreglos planos
+UNSEEN, FRONTIER, EXPLORED = 0, 1, 2
+
+# Expansiones por celda del laberinto que IDA* puede hacer antes de rendirse (ver solve_ida_star)
+IDA_EXPANSIONS_PER_CELL = 8
+
+# Caracteres de celdas libres: espacio, inicio, meta y los dígitos 1-9 de terreno con costo
+FREE_CELLS = " AB123456789"
+
+# Tabla para traducir una línea ASCII del archivo a bits: las celdas libres son '0',
+# cualquier otro carácter es pared ('1')
+WALL_BITS = bytes(ord("0") if chr(b) in FREE_CELLS else ord("1") for b in range(256))
+
+# Costo de entrar a una celda según su carácter: el dígito 1-9, o 1 para cualquier otro
+CELL_COSTS = bytes(b - ord("0") if chr(b) in "123456789" else 1 for b in range(256))
+DIGITS = re.compile("[1-9]")
+
+# Formato binario: cabecera (firma, versión, alto, ancho, inicio, meta; -1 si no hay)
+# seguida de las filas de un BitGrid tal cual, un bit por celda
+BINARY_MAGIC = b"MAZB"
+BINARY_VERSION = 1
+BINARY_HEADER = struct.Struct("<4sHIIiiii")
+
+class BitRow():
+    """Read-only view of one row of a BitGrid, indexable like a list of bools."""
+    def __init__(self, grid, i):
+        self.grid = grid
+        self.offset = i * grid.row_bytes
+
+    def __len__(self):
+        return self.grid.width
+
+    def __getitem__(self, j):
+        if not 0 <= j < self.grid.width:
+            raise IndexError("row index out of range")
+        return bool(self.grid.bits[self.offset + (j >> 3)] >> (7 - (j & 7)) & 1)
+
+    def __iter__(self):
+        for j in range(self.grid.width):
+            yield self[j]
+
+class BitGrid():
+    """Wall grid packed one bit per cell, with each row aligned to whole bytes.
+
+    `grid[i][j]` and iteration by rows behave like the list of lists of bools
+    that `Maze` builds by default, so code written against `Maze.walls` keeps working.
+    Cells can also be addressed by integer index `i * width + j`.
+    """
+    def __init__(self, height, width, bits=None):
+        self.height = height
+        self.width = width
+        self.row_bytes = (width + 7) // 8
+        self.bits = bytearray(height * self.row_bytes) if bits is None else bits
+
+    @classmethod
+    def from_flags(cls, flags, height, width):
+        """Packs a flat one-byte-per-cell wall array (1 = wall), like Maze.wall_flags()."""
+        grid = cls(height, width)
+        size = grid.row_bytes * 8
+        cells = flags.translate(PACK_BITS)
+        for i in range(height):
+            row = cells[i * width:(i + 1) * width].ljust(size, b"0")
+            grid.set_row(i, int(row or b"0", 2).to_bytes(grid.row_bytes, "big"))
+        return grid
+
+    def set_row(self, i, packed):
+        self.bits[i * self.row_bytes:(i + 1) * self.row_bytes] = packed
+
+    def __len__(self):
+        return self.height
+
+    def __getitem__(self, i):
+        if not 0 <= i < self.height:
+            raise IndexError("grid index out of range")
+        return BitRow(self, i)
+
+    def __iter__(self):
+        for i in range(self.height):
+            yield BitRow(self, i)
+
+    def is_wall(self, i, j):
+        return self.bits[i * self.row_bytes + (j >> 3)] >> (7 - (j & 7)) & 1 == 1
+
+    def set_wall(self, i, j, wall):
+        mask = 1 << (7 - (j & 7))
+        if wall:
+            self.bits[i * self.row_bytes + (j >> 3)] |= mask
+        else:
+            self.bits[i * self.row_bytes + (j >> 3)] &= ~mask & 0xFF
+
+    def index(self, state):
+        return state[0] * self.width + state[1]
+
+    def state(self, index):
+        return divmod(index, self.width)
+
+    def wall_at(self, index):
+        return self.is_wall(*divmod(index, self.width))
+
+    def nbytes(self):
+        return len(self.bits)
+
+    def unpacked(self):
+        """Returns the walls as a flat bytearray, one byte per cell (1 = wall)."""
+        flags = bytearray()
+        size = self.row_bytes * 8
+        for i in range(self.height):
+            row = self.bits[i * self.row_bytes:(i + 1) * self.row_bytes]
+            bits = bin(int.from_bytes(row, "big") | 1 << size)[3:3 + self.width]
+            flags += bits.encode("ascii").translate(UNPACK_BITS)
+        return flags
+
+def pack_line(line, size):
+    """Packs a maze file line into `size // 8` bytes, one bit per cell (1 = wall)."""
+    if line.isascii():
+        bits = line.encode("ascii").translate(WALL_BITS)
+    else:
+        bits = "".join("0" if ch in FREE_CELLS else "1" for ch in line).encode("ascii")
+    return int(bits.ljust(size, b"0") or b"0", 2).to_bytes(size // 8, "big")
+
+def line_costs(line):
+    """Returns the cost of entering each cell of a maze file line, one byte per cell."""
+    if line.isascii():
+        return line.encode("ascii").translate(CELL_COSTS)
+    return bytes(CELL_COSTS[ord(ch)] if ch.isascii() else 1 for ch in line)
+
+# Bytes por celda (0 libre, 1 pared) -> caracteres de un tablero de bits de celdas libres
+OPEN_BITS = bytes(ord("1") if b == 0 else ord("0") for b in range(256))
+
+# Byte por celda (0 libre, 1 pared) -> carácter '0' / '1'
+PACK_BITS = bytes(ord("1") if b else ord("0") for b in range(256))
+
+# Byte por celda (0 libre, 1 pared) -> carácter del formato de texto
+TEXT_CELLS = bytes(ord("#") if b else ord(" ") for b in range(256))
+
+# Paleta de Maze.output_image: índice -> color RGB
+BORDER_COLOR, WALL_COLOR, START_COLOR, GOAL_COLOR, SOLUTION_COLOR, EXPLORED_COLOR, EMPTY_COLOR = range(7)
+PALETTE = [
+    0, 0, 0,  # Bordes
+    40, 40, 40,  # Paredes
+    255, 0, 0,  # Inicio
+    0, 171, 28,  # Meta
+    220, 235, 113,  # Solución
+    212, 97, 85,  # Exploradas
+    237, 240, 252,  # Celdas vacías
+]
+
+# Byte por celda (0 libre, 1 pared) -> índice de paleta
+CELL_COLORS = bytes(WALL_COLOR if b else EMPTY_COLOR for b in range(256))
+
+# 2 * pared + explorada (0 libre, 1 explorada, 2 y 3 pared) -> índice de paleta
+EXPLORED_CELL_COLORS = bytes((EMPTY_COLOR, EXPLORED_COLOR, WALL_COLOR, WALL_COLOR)) + bytes(252)
+
+# Rachas de 4 o más caracteres iguales, para comprimir la salida de Maze.print
+RUNS = re.compile(r"(.)\1{3,}")
+
+# Tabla inversa: '0' -> 0 (libre), '1' -> 1 (pared)
+UNPACK_BITS = bytes(b - ord("0") if chr(b) in "01" else 0 for b in range(256))
+
+class CellSet():
+    """Set-like view of the cells whose flag equals `value` in a flat per-cell array.
+
+    Lets the array-based solvers expose `Maze.explored` without building a set of tuples.
+    """
+    def __init__(self, flags, width, value):
+        self.flags = flags
+        self.width = width
+        self.value = value
+
+    def __contains__(self, state):
+        i, j = state
+        return 0 <= j < self.width and 0 <= i * self.width + j < len(self.flags) \
+            and self.flags[i * self.width + j] == self.value
+
+    def __len__(self):
+        return self.flags.count(self.value)
+
+    def __iter__(self):
+        for index, flag in enumerate(self.flags):
+            if flag == self.value:
+                yield divmod(index, self.width)
+
+class CorridorGraph():
+    """Weighted graph over the junctions, dead ends, start and goal of a maze.
+
+    `edges[node]` lists `(target, length, cells, actions)` for every corridor leaving
+    `node`, where nodes and `cells` are cell indices `i * width + j` and `actions`
+    holds indexes into ACTIONS, one per cell of the corridor.
+    """
+    def __init__(self, width, start, goal):
+        self.width = width
+        self.start = start
+        self.goal = goal
+        self.edges = {}
+
+class DistanceField():
+    """BFS distances to one goal cell and the first move of a shortest path from every cell.
+
+    Both arrays are indexed by `i * width + j`; unreachable cells and walls have distance -1.
+    """
+    def __init__(self, goal, width, distance, moves):
+        self.goal = goal
+        self.width = width
+        self.distance = distance
+        self.moves = moves
+
+    def nbytes(self):
+        return self.distance.itemsize * len(self.distance) + len(self.moves)
+
+class DStarLite():
+    """D* Lite planner over the free cells of a maze, searching from the goal back to the start.
+
+    `g` and `rhs` are indexed by `i * width + j`. After walls change or the start moves,
+    `compute` only re-expands the cells whose distance to the goal changed, so replanning
+    costs in proportion to the affected region instead of the whole maze.
+    """
+    INFINITY = 2 ** 62
+
+    def __init__(self, walls, height, width, start, goal):
+        size = height * width
+        self.walls = walls
+        self.height = height
+        self.width = width
+        self.start = start[0] * width + start[1]
+        self.goal = goal[0] * width + goal[1]
+        self.last_start = self.start
+        self.km = 0  # Corrección de las claves por los movimientos del inicio
+        self.g = array("q", [self.INFINITY]) * size
+        self.rhs = array("q", [self.INFINITY]) * size
+        self.rhs[self.goal] = 0
+        self.heap = [self.key(self.goal) + (self.goal,)]
+        self.pushes = 1  # Inserciones en el montículo desde la última llamada a compute
+
+    def distance(self, a, b):
+        (ar, ac), (br, bc) = divmod(a, self.width), divmod(b, self.width)
+        return abs(ar - br) + abs(ac - bc)
+
+    def key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self.distance(self.start, cell) + self.km, best)
+
+    def neighbors(self, cell):
+        width = self.width
+        col = cell % width
+        return (
+            cell - width if cell >= width else -1,
+            cell + width if cell < len(self.walls) - width else -1,
+            cell - 1 if col > 0 else -1,
+            cell + 1 if col < width - 1 else -1,
+        )
+
+    def update(self, cell):
+        """Recomputes rhs(cell) from its free neighbors and queues the cell if it became inconsistent."""
+        g = self.g
+        if cell != self.goal:
+            best = self.INFINITY
+            if not self.walls[cell]:
+                for neighbor in self.neighbors(cell):
+                    if neighbor >= 0 and not self.walls[neighbor] and g[neighbor] + 1 < best:
+                        best = g[neighbor] + 1
+            self.rhs[cell] = best
+        if g[cell] != self.rhs[cell]:
+            heapq.heappush(self.heap, self.key(cell) + (cell,))
+            self.pushes += 1
+
+    def set_wall(self, cell, wall):
+        self.walls[cell] = wall
+        self.update(cell)
+        for neighbor in self.neighbors(cell):
+            if neighbor >= 0:
+                self.update(neighbor)
+
+    def move_start(self, cell):
+        self.km += self.distance(self.last_start, cell)
+        self.last_start = self.start = cell
+
+    def compute(self, stats, on_expand=None):
+        """Expands inconsistent cells until the start is consistent; returns the expanded cells.
+
+        The heap may hold outdated entries (borrado perezoso): an entry is skipped when its
+        cell is already consistent, and pushed again when its key changed. Counters go to
+        the SearchStats `stats`, and `on_expand` is called with each expanded (row, col).
+        """
+        g, rhs, heap, start = self.g, self.rhs, self.heap, self.start
+        expanded = []
+        while heap and (heap[0][:2] < self.key(start) or rhs[start] != g[start]):
+            stats.max_frontier = max(stats.max_frontier, len(heap))
+            k1, k2, cell = heapq.heappop(heap)
+            stats.pops += 1
+            if g[cell] == rhs[cell]:
+                stats.stale_pops += 1
+                continue
+            key = self.key(cell)
+            if (k1, k2) != key:
+                stats.stale_pops += 1
+                heapq.heappush(heap, key + (cell,))
+                self.pushes += 1
+                continue
+            expanded.append(cell)
+            stats.neighbor_calls += 1
+            if on_expand is not None:
+                on_expand(divmod(cell, self.width))
+            if g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = self.INFINITY
+                self.update(cell)
+            for neighbor in self.neighbors(cell):
+                if neighbor >= 0:
+                    self.update(neighbor)
+        stats.pushes = self.pushes
+        self.pushes = 0
+        return expanded
+
+    def path(self):
+        """Returns (actions, cells) from the start down the g values to the goal, or None."""
+        g, width = self.g, self.width
+        cell = self.start
+        if g[cell] >= self.INFINITY:
+            return None
+        actions = []
+        cells = []
+        while cell != self.goal:
+            move, cell = min(
+                ((move, neighbor) for move, neighbor in enumerate(self.neighbors(cell))
+                 if neighbor >= 0 and not self.walls[neighbor]),
+                key=lambda option: g[option[1]]
+            )
+            actions.append(ACTIONS[move])
+            cells.append(divmod(cell, width))
+        return (actions, cells)
+
+class SearchStats():
+    """Counters and timings of the last search, filled in by every `solve_*` (see Maze.stats).
+
+    `pushes` and `pops` count frontier insertions and removals, `stale_pops` the removals
+    discarded because the cell was already expanded or reached more cheaply. `wall_time`
+    and `cpu_time` map each phase (parse, search, path, render) to seconds; the path
+    reconstruction is not included in the search time.
+    """
+    def __init__(self, previous=None):
+        self.pushes = 0
+        self.pops = 0
+        self.stale_pops = 0
+        self.max_frontier = 0
+        self.max_explored = 0
+        self.neighbor_calls = 0
+        self.wall_time = {}
+        self.cpu_time = {}
+        # El tiempo de lectura pertenece al laberinto, no a la búsqueda: se conserva entre búsquedas
+        if previous is not None and "parse" in previous.wall_time:
+            self.wall_time["parse"] = previous.wall_time["parse"]
+            self.cpu_time["parse"] = previous.cpu_time["parse"]
+
+    def clock(self):
+        return (time.perf_counter(), time.process_time())
+
+    def record(self, phase, started):
+        """Adds the time since `started` (a value returned by `clock`) to `phase`."""
+        self.wall_time[phase] = self.wall_time.get(phase, 0.0) + time.perf_counter() - started[0]
+        self.cpu_time[phase] = self.cpu_time.get(phase, 0.0) + time.process_time() - started[1]
+
+    def as_dict(self):
+        return {
+            "pushes": self.pushes,
+            "pops": self.pops,
+            "stale_pops": self.stale_pops,
+            "max_frontier": self.max_frontier,
+            "max_explored": self.max_explored,
+            "neighbor_calls": self.neighbor_calls,
+            "wall_time": dict(self.wall_time),
+            "cpu_time": dict(self.cpu_time),
+        }
+
+class SearchStep():
+    """One batch of expansions of a stepwise search (see Maze.search_steps).
+
+    `expanded` lists the cells moved from the frontier to the explored set, in order, and
+    `discovered` the cells added to the frontier; A* lists a cell again when it finds a
+    shorter way to it. `solution` is set on the last step if the goal was reached.
+    """
+    __slots__ = ("expanded", "discovered", "solution")
+
+    def __init__(self):
+        self.expanded = []
+        self.discovered = []
+        self.solution = None
+
+def instrumented(solve):
+    """Gives a `solve_*` method a fresh Maze.stats and times its search phase."""
+    @wraps(solve)
+    def wrapper(self, *args, **kwargs):
+        stats = self.stats = SearchStats(self.stats)
+        started = stats.clock()
+        try:
+            return solve(self, *args, **kwargs)
+        finally:
+            stats.record("search", started)
+            for times in (stats.wall_time, stats.cpu_time):
+                times["search"] -= times.get("path", 0.0)
+            stats.max_explored = max(stats.max_explored, len(getattr(self, "explored", ())))
+            self.max_frontier = stats.max_frontier
+    return wrapper
 
 class Maze():
-    def __init__(self, filename):
-        # Read file and set height and width of maze
+    def __init__(self, filename, compact=False, strict=True):
+        self._init_state()
+        started = self.stats.clock()
+
+        # Read file row by row, finding start and goal while the walls are built.
+        # Con compact=True cada fila se empaqueta a bits al leerla (ver BitGrid),
+        # así que la memoria máxima queda cerca del tamaño final de la grilla
+        starts = goals = 0
+        self.height = self.width = 0
+        rows = []
+        bits = bytearray()
+        row_bytes = 0
+        cost_rows = None  # Costos fila por fila, solo desde que aparece el primer dígito
         with open(filename) as f:
-            contents = f.read()
+            for i, line in enumerate(f):
+                if line.endswith("\n"):
+                    line = line[:-1]
+                if "A" in line:
+                    starts += line.count("A")
+                    self.start = (i, line.rindex("A"))
+                if "B" in line:
+                    goals += line.count("B")
+                    self.goal = (i, line.rindex("B"))
+                self.height += 1
+                self.width = max(self.width, len(line))
+                if cost_rows is not None or DIGITS.search(line):
+                    if cost_rows is None:
+                        cost_rows = [b""] * i
+                    cost_rows.append(line_costs(line))
 
-        # Validate start and goal
-        if contents.count("A") != 1:
+                if not compact:
+                    rows.append([ch not in FREE_CELLS for ch in line])
+                    continue
+                packed = pack_line(line, (len(line) + 7) // 8 * 8)
+                if len(packed) > row_bytes:
+                    # Fila más larga que las anteriores: reacomodar las filas ya leídas al nuevo ancho
+                    bits = bytearray(b"".join(
+                        bits[k * row_bytes:(k + 1) * row_bytes].ljust(len(packed), b"\0") for k in range(i)
+                    ))
+                    row_bytes = len(packed)
+                bits += packed.ljust(row_bytes, b"\0")
+
+        # Validate start and goal (con strict=False pueden faltar, p. ej. para usar Maze.query)
+        if strict and starts != 1:
             raise Exception("maze must have exactly one start point")
-        if contents.count("B") != 1:
+        if strict and goals != 1:
             raise Exception("maze must have exactly one goal")
 
-        # Determine height and width of maze
-        contents = contents.splitlines()
-        self.height = len(contents)
-        self.width = max(len(line) for line in contents)
-
-        # Keep track of walls
-        self.walls = []
-        for i in range(self.height):
-            row = []
-            for j in range(self.width):
-                try:
-                    if contents[i][j] == "A":
-                        self.start = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == "B":
-                        self.goal = (i, j)
-                        row.append(False)
-                    elif contents[i][j] == " ":
-                        row.append(False)
-                    else:
-                        row.append(True)
-                except IndexError:
-                    row.append(False)
-            self.walls.append(row)
+        # Keep track of walls (las filas cortas se completan con celdas libres)
+        if compact:
+            self.walls = BitGrid(self.height, self.width, bits)
+        else:
+            for row in rows:
+                row.extend([False] * (self.width - len(row)))
+            self.walls = rows
+        if cost_rows is not None:
+            self.costs = bytearray(b"".join(row.ljust(self.width, b"\x01") for row in cost_rows))
+        self.stats.record("parse", started)
 
+    def _init_state(self):
         self.solution = None
+        self._graph = None  # Grafo de corredores, se construye la primera vez que se pide
+        self.components = None  # Índice de componentes conexas (ver build_components)
+        self._fields = OrderedDict()  # Campos de distancia por meta, del menos al más usado
+        self.field_cache_bytes = 64 * 2 ** 20  # Memoria máxima para los campos en caché
+        self._planner = None  # Búsqueda D* Lite que solve_incremental repara tras cada cambio
+        self.stats = SearchStats()
+        self.on_expand = None  # Función opcional llamada con cada estado expandido
+        self.start = None
+        self.goal = None
+        self.costs = None  # Costo de entrar a cada celda (i * width + j), None si todas cuestan 1
+        self.solution_cost = None
 
-    def print(self):
-        solution = self.solution[1] if self.solution is not None else None
-        print()
-        for i, row in enumerate(self.walls):
-            for j, col in enumerate(row):
-                if col:
-                    print("█", end="")
-                elif (i, j) == self.start:
-                    print("A", end="")
-                elif (i, j) == self.goal:
-                    print("B", end="")
-                elif solution is not None and (i, j) in solution:
-                    print("*", end="")
-                else:
-                    print(" ", end="")
-            print()
-        print()
+    @classmethod
+    def from_flags(cls, flags, height, width, start, goal, compact=True, costs=None):
+        """Builds a maze from a flat one-byte-per-cell wall array (1 = wall), without a file.
+
+        `costs`, if given, is a flat array with the cost (1-9) of entering each cell.
+        """
+        maze = cls.__new__(cls)
+        maze._init_state()
+        maze.height = height
+        maze.width = width
+        if compact:
+            maze.walls = BitGrid.from_flags(flags, height, width)
+        else:
+            maze.walls = [[bool(flag) for flag in flags[i * width:(i + 1) * width]] for i in range(height)]
+        maze.start = start
+        maze.goal = goal
+        if costs is not None:
+            maze.costs = bytearray(costs)
+        return maze
+
+    @classmethod
+    def load_binary(cls, filename, copy=False):
+        """Loads a maze saved with save_binary.
+
+        The walls are a BitGrid over a read-only memoryview of the memory-mapped file,
+        so nothing is parsed or copied; pass copy=True to get an editable bytearray.
+        """
+        with open(filename, "rb") as f:
+            # mmap no acepta archivos vacíos: revisar el tamaño antes de mapear
+            if os.fstat(f.fileno()).st_size < BINARY_HEADER.size:
+                raise Exception("not a binary maze file")
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, height, width, start_row, start_col, goal_row, goal_col = \
+            BINARY_HEADER.unpack_from(data)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise Exception("not a binary maze file")
+        size = height * ((width + 7) // 8)
+        if len(data) != BINARY_HEADER.size + size:
+            raise Exception("truncated binary maze file")
+
+        maze = cls.__new__(cls)
+        maze._init_state()
+        started = maze.stats.clock()
+        maze.height = height
+        maze.width = width
+        bits = memoryview(data)[BINARY_HEADER.size:]
+        maze.walls = BitGrid(height, width, bytearray(bits) if copy else bits)
+        maze.start = (start_row, start_col) if start_row >= 0 else None
+        maze.goal = (goal_row, goal_col) if goal_row >= 0 else None
+        maze.stats.record("parse", started)
+        return maze
+
+    def save_binary(self, filename):
+        """Saves the maze in the packed binary format read by load_binary."""
+        if self.costs is not None:
+            raise Exception("the binary format does not store terrain costs")
+        walls = self.walls
+        if not isinstance(walls, BitGrid):
+            walls = BitGrid.from_flags(self.wall_flags(), self.height, self.width)
+        start = self.start if self.start is not None else (-1, -1)
+        goal = self.goal if self.goal is not None else (-1, -1)
+        with open(filename, "wb") as f:
+            f.write(BINARY_HEADER.pack(BINARY_MAGIC, BINARY_VERSION, self.height, self.width, *start, *goal))
+            f.write(walls.bits)
+
+    def save_text(self, filename):
+        """Saves the maze in the text format, with '#' for walls and digits for terrain costs."""
+        cells = bytearray(self.wall_flags().translate(TEXT_CELLS))
+        if self.costs is not None:
+            for cell, cost in enumerate(self.costs):
+                if cost > 1 and cells[cell] == ord(" "):
+                    cells[cell] = ord("0") + cost
+        for state, char in ((self.start, b"A"), (self.goal, b"B")):
+            if state is not None:
+                cells[state[0] * self.width + state[1]] = ord(char)
+        with open(filename, "wb") as f:
+            for i in range(self.height):
+                f.write(cells[i * self.width:(i + 1) * self.width] + b"\n")
+
+    def print(self, margin=None, compress=False):
+        """Writes the maze (and the solution, if any) to stdout in a single write."""
+        sys.stdout.write("\n" + self.render(margin, compress) + "\n")
+
+    def render(self, margin=None, compress=False):
+        """Returns the text drawn by `print`, one line per row.
+
+        With `margin`, only the box around the solution (or start and goal) plus
+        `margin` cells on each side is drawn. With `compress`, runs of 4 or more equal
+        characters are written as the character followed by the count in braces.
+        """
+        started = self.stats.clock()
+        flags = self.wall_flags()
+        chars = flags.translate(TEXT_CELLS)  # '#' se dibuja como '█'
+        width = self.width
+        solution = self.solution[1] if self.solution is not None else []
+        for i, j in solution:
+            if not flags[i * width + j]:
+                chars[i * width + j] = ord("*")
+        for state, char in ((self.goal, "B"), (self.start, "A")):
+            if state is not None and not flags[state[0] * width + state[1]]:
+                chars[state[0] * width + state[1]] = ord(char)
+        marks = [state for state in (self.start, self.goal) if state is not None]
+
+        # Recorte: caja que contiene el camino, ampliada en `margin` celdas
+        top, bottom, left, right = 0, self.height, 0, width
+        if margin is not None and (solution or marks):
+            rows = [i for i, _ in solution] + [i for i, _ in marks]
+            cols = [j for _, j in solution] + [j for _, j in marks]
+            top, bottom = max(min(rows) - margin, 0), min(max(rows) + margin + 1, self.height)
+            left, right = max(min(cols) - margin, 0), min(max(cols) + margin + 1, width)
+
+        text = chars.decode("ascii")
+        lines = [text[i * width + left:i * width + right].replace("#", "█") for i in range(top, bottom)]
+        if compress:
+            lines = [RUNS.sub(lambda run: f"{run.group(1)}{{{len(run.group(0))}}}", line) for line in lines]
+        text = "".join(line + "\n" for line in lines)
+        self.stats.record("render", started)
+        return text
 
     def neighbors(self, state):
+        self.stats.neighbor_calls += 1
         row, col = state
         candidates = [
             ("up", (row - 1, col)),
@@ -122,22 +685,89 @@ class Maze():
                 result.append((action, (r, c)))
         return result
 
-    def solve_bfs(self):
+    def wall_flags(self):
+        """Returns the walls as a flat bytearray indexed by `i * width + j` (1 = wall)."""
+        if isinstance(self.walls, BitGrid):
+            return self.walls.unpacked()
+        return bytearray(chain.from_iterable(self.walls))
+
+    def build_components(self):
+        """Labels every free cell with the id of its connected component (walls get -1).
+
+        Once built, solvers fail immediately when start and goal are in different
+        components, and `reachable` answers in O(1).
+        """
+        width = self.width
+        size = self.height * width
+        walls = self.wall_flags()
+        labels = array("i", [-1]) * size
+        label = 0
+        for origin in range(size):
+            if walls[origin] or labels[origin] >= 0:
+                continue
+            labels[origin] = label
+            frontier = [origin]
+            while frontier:
+                cell = frontier.pop()
+                col = cell % width
+                for neighbor in (
+                    cell - width if cell >= width else -1,
+                    cell + width if cell < size - width else -1,
+                    cell - 1 if col > 0 else -1,
+                    cell + 1 if col < width - 1 else -1,
+                ):
+                    if neighbor >= 0 and labels[neighbor] < 0 and not walls[neighbor]:
+                        labels[neighbor] = label
+                        frontier.append(neighbor)
+            label += 1
+        self.components = labels
+        self.num_components = label
+        return labels
+
+    def reachable(self, a, b):
+        """Tells whether free cells `a` and `b` are connected, building the component index if needed."""
+        if self.components is None:
+            self.build_components()
+        if not all(0 <= r < self.height and 0 <= c < self.width for r, c in (a, b)):
+            return False
+        label = self.components[a[0] * self.width + a[1]]
+        return label >= 0 and label == self.components[b[0] * self.width + b[1]]
+
+    def _check_reachable(self):
+        """Fails fast when the component index shows that the goal cannot be reached."""
+        if self.components is not None and not self.reachable(self.start, self.goal):
+            self.num_explored = 0
+            self.explored = set()
+            raise Exception("no solution")
+
+    @instrumented
+    def solve_bfs(self, flat=False):
         """Finds a solution to maze using BFS, if one exists."""
+        self._check_reachable()
+        if flat:
+            return self._solve_flat(depth_first=False)
         self.num_explored = 0
+        stats = self.stats
+        on_expand = self.on_expand
         start = Node(state=self.start, parent=None, action=None)
         frontier = QueueFrontier()  # BFS
         frontier.add(start)
+        stats.pushes += 1
         self.explored = set()
 
         while True:
             if frontier.empty():
                 raise Exception("no solution")
 
+            stats.max_frontier = max(stats.max_frontier, len(frontier.frontier))
             node = frontier.remove()
+            stats.pops += 1
             self.num_explored += 1
+            if on_expand is not None:
+                on_expand(node.state)
 
             if node.state == self.goal:
+                started = stats.clock()
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -147,6 +777,7 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                stats.record("path", started)
                 return
 
             self.explored.add(node.state)
@@ -155,23 +786,36 @@ class Maze():
                 if not frontier.contains_state(state) and state not in self.explored:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
+                    stats.pushes += 1
 
-    def solve_dfs(self):
+    @instrumented
+    def solve_dfs(self, flat=False):
         """Finds a solution to maze using DFS, if one exists."""
+        self._check_reachable()
+        if flat:
+            return self._solve_flat(depth_first=True)
         self.num_explored = 0
+        stats = self.stats
+        on_expand = self.on_expand
         start = Node(state=self.start, parent=None, action=None)
         frontier = StackFrontier()  # DFS
         frontier.add(start)
+        stats.pushes += 1
         self.explored = set()
 
         while True:
             if frontier.empty():
                 raise Exception("no solution")
 
+            stats.max_frontier = max(stats.max_frontier, len(frontier.frontier))
             node = frontier.remove()
+            stats.pops += 1
             self.num_explored += 1
+            if on_expand is not None:
+                on_expand(node.state)
 
             if node.state == self.goal:
+                started = stats.clock()
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -181,6 +825,7 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                stats.record("path", started)
                 return
 
             self.explored.add(node.state)
@@ -189,20 +834,229 @@ class Maze():
                 if not frontier.contains_state(state) and state not in self.explored:
                     child = Node(state=state, parent=node, action=action)
                     frontier.add(child)
+                    stats.pushes += 1
+
+    def _solve_flat(self, depth_first):
+        """BFS/DFS over preallocated per-cell arrays instead of Node objects.
+
+        Explores cells in the same order as the Node-based version and leaves
+        the same `solution` and `num_explored`; `explored` becomes a CellSet.
+        """
+        width = self.width
+        size = self.height * width
+        walls = self.wall_flags()
 
-    def solve_a_star(self):
-        """Finds a solution to maze using A*, if one exists."""
+        # Estado, padre y acción de cada celda, indexados por i * width + j
+        flags = bytearray(size)
+        parent = array("l", [-1]) * size
+        action = bytearray(size)
+
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        frontier = deque([start])
+        remove = frontier.pop if depth_first else frontier.popleft
+        flags[start] = FRONTIER
+        self.num_explored = 0
+        stats = self.stats
+        stats.pushes = 1
+        on_expand = self.on_expand
+        self.explored = CellSet(flags, width, EXPLORED)
+
+        while frontier:
+            stats.max_frontier = max(stats.max_frontier, len(frontier))
+            cell = remove()
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(divmod(cell, width))
+
+            if cell == goal:
+                stats.pops = self.num_explored
+                started = stats.clock()
+                self.solution = self._flat_path(parent, action, start, goal)
+                stats.record("path", started)
+                return
+
+            flags[cell] = EXPLORED
+            stats.neighbor_calls += 1
+
+            # Vecinos en el mismo orden que Maze.neighbors: arriba, abajo, izquierda, derecha
+            col = cell % width
+            for move, neighbor in enumerate((
+                cell - width if cell >= width else -1,
+                cell + width if cell < size - width else -1,
+                cell - 1 if col > 0 else -1,
+                cell + 1 if col < width - 1 else -1,
+            )):
+                if neighbor >= 0 and not flags[neighbor] and not walls[neighbor]:
+                    flags[neighbor] = FRONTIER
+                    parent[neighbor] = cell
+                    action[neighbor] = move
+                    frontier.append(neighbor)
+                    stats.pushes += 1
+
+        stats.pops = self.num_explored
+        raise Exception("no solution")
+
+    def _flat_path(self, parent, action, start, cell):
+        """Builds (actions, cells) from per-cell parent and action arrays, walking back from `cell`."""
+        width = self.width
+        actions = []
+        cells = []
+        while cell != start:
+            actions.append(ACTIONS[action[cell]])
+            cells.append(divmod(cell, width))
+            cell = parent[cell]
+        actions.reverse()
+        cells.reverse()
+        return (actions, cells)
+
+    def search_steps(self, method="bfs", batch=1):
+        """Runs a search lazily, yielding a SearchStep every `batch` expansions.
+
+        `method` is "bfs", "dfs" or "a_star", expanding cells in the same order as the
+        matching solve_* method. While the search advances, `num_explored`, `explored`
+        and the counters in `stats` are kept up to date; once the goal is expanded the
+        last step carries the solution, also stored in `solution`. If the frontier runs
+        out, the generator raises "no solution" after yielding the pending expansions.
+        Pausing costs nothing and closing the generator abandons the search.
+        """
+        if method not in ("bfs", "dfs", "a_star"):
+            raise Exception(f"unknown method: {method}")
+        self._check_reachable()
+        width = self.width
+        size = self.height * width
+        walls = self.wall_flags()
+        flags = bytearray(size)
+        parent = array("l", [-1]) * size
+        action = bytearray(size)
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        goal_row, goal_col = self.goal
+
+        self.solution = None
+        self.num_explored = 0
+        self.explored = CellSet(flags, width, EXPLORED)
+        stats = self.stats = SearchStats(self.stats)
+
+        # BFS y DFS usan una deque como _solve_flat; A* un montículo (f, h, orden, celda) con el costo g por celda
+        a_star = method == "a_star"
+        if a_star:
+            cost = array("l", [-1]) * size
+            cost[start] = 0
+            h = abs(self.start[0] - goal_row) + abs(self.start[1] - goal_col)
+            frontier = [(h, h, 0, start)]
+        else:
+            frontier = deque([start])
+            remove = frontier.pop if method == "dfs" else frontier.popleft
+        flags[start] = FRONTIER
+        stats.pushes = 1
+        step = SearchStep()
+
+        while frontier:
+            stats.max_frontier = max(stats.max_frontier, len(frontier))
+            stats.pops += 1
+            if a_star:
+                cell = heapq.heappop(frontier)[3]
+                if flags[cell] == EXPLORED:
+                    stats.stale_pops += 1
+                    continue
+            else:
+                cell = remove()
+            self.num_explored += 1
+            step.expanded.append(divmod(cell, width))
+
+            if cell == goal:
+                step.solution = self.solution = self._flat_path(parent, action, start, goal)
+                yield step
+                return
+
+            flags[cell] = EXPLORED
+            stats.neighbor_calls += 1
+            col = cell % width
+            for move, neighbor in enumerate((
+                cell - width if cell >= width else -1,
+                cell + width if cell < size - width else -1,
+                cell - 1 if col > 0 else -1,
+                cell + 1 if col < width - 1 else -1,
+            )):
+                if neighbor < 0 or walls[neighbor]:
+                    continue
+                if a_star:
+                    g = cost[cell] + 1
+                    if flags[neighbor] == EXPLORED or 0 <= cost[neighbor] <= g:
+                        continue
+                    cost[neighbor] = g
+                    r, c = divmod(neighbor, width)
+                    h = abs(r - goal_row) + abs(c - goal_col)
+                    heapq.heappush(frontier, (g + h, h, stats.pushes, neighbor))
+                elif flags[neighbor]:
+                    continue
+                else:
+                    frontier.append(neighbor)
+                flags[neighbor] = FRONTIER
+                parent[neighbor] = cell
+                action[neighbor] = move
+                stats.pushes += 1
+                step.discovered.append(divmod(neighbor, width))
+
+            if len(step.expanded) >= batch:
+                yield step
+                step = SearchStep()
+
+        if step.expanded:
+            yield step
+        raise Exception("no solution")
+
+    @instrumented
+    def solve_a_star(self, max_states=None, fallback_states=None, max_expansions=None):
+        """Finds a solution to maze using A*, if one exists.
+
+        With `max_states`, once A* knows more states than that it drops its frontier and
+        finishes with the IDA* of `solve_ida_star`, starting from the lowest pending f.
+        The memory A* frees (frontier, nodes and costs) pays for an IDA* table of
+        `fallback_states` states, twice `max_states` by default; `max_expansions` bounds
+        the IDA* phase as in `solve_ida_star`, which raises "memory limit reached".
+        """
+        self._check_reachable()
         self.num_explored = 0
         start = Node(state=self.start, parent=None, action=None, cost=0)
-        frontier = []
-        heapq.heappush(frontier, start)
+        h = start.heuristic(self.goal)
+
+        # Entradas (f, h, orden de llegada, nodo): la heurística se calcula contra la meta real,
+        # y el contador desempata sin llegar nunca a comparar nodos
+        frontier = [(h, h, 0, start)]
+        pushed = 1
+        best_cost = {self.start: 0}  # Mejor costo g conocido para cada estado
         self.explored = set()
+        stats = self.stats
+        on_expand = self.on_expand
+        limit = float("inf") if max_states is None else max_states
 
         while frontier:
-            node = heapq.heappop(frontier)
+            if len(best_cost) > limit:
+                # Sin memoria para seguir con A*: el menor f pendiente es cota inferior del costo óptimo
+                threshold = frontier[0][0]
+                stats.pushes = pushed
+                frontier = best_cost = None
+                self.explored = set()
+                if fallback_states is None:
+                    fallback_states = 2 * max_states
+                self.solution = self._ida_star(fallback_states, threshold, max_expansions)
+                return
+            stats.max_frontier = max(stats.max_frontier, len(frontier))
+            node = heapq.heappop(frontier)[3]
+            stats.pops += 1
+
+            # Borrado perezoso: descartar entradas superadas por un camino más corto
+            if node.cost > best_cost[node.state] or node.state in self.explored:
+                stats.stale_pops += 1
+                continue
             self.num_explored += 1
+            if on_expand is not None:
+                on_expand(node.state)
 
             if node.state == self.goal:
+                started = stats.clock()
                 actions = []
                 cells = []
                 while node.parent is not None:
@@ -212,14 +1066,922 @@ class Maze():
                 actions.reverse()
                 cells.reverse()
                 self.solution = (actions, cells)
+                stats.pushes = pushed
+                stats.record("path", started)
                 return
 
             self.explored.add(node.state)
 
+            cost = node.cost + 1
             for action, state in self.neighbors(node.state):
-                if state not in self.explored:
-                    child = Node(state=state, parent=node, action=action, cost=node.cost + 1)
-                    heapq.heappush(frontier, child)
+                if state not in self.explored and cost < best_cost.get(state, cost + 1):
+                    best_cost[state] = cost
+                    child = Node(state=state, parent=node, action=action, cost=cost)
+                    h = child.heuristic(self.goal)
+                    heapq.heappush(frontier, (cost + h, h, pushed, child))
+                    pushed += 1
+
+        stats.pushes = pushed
+        raise Exception("no solution")
+
+    @instrumented
+    def solve_ida_star(self, max_states=2 ** 18, max_expansions=None):
+        """Finds a solution to maze using IDA* (iterative deepening A*), if one exists.
+
+        Depth-first searches bounded by f = g + h, pruning repeated states with a table
+        of at most `max_states` entries. Once the table is full, the search gives up with
+        "memory limit reached" after `max_expansions` more expansions (by default
+        IDA_EXPANSIONS_PER_CELL per cell). `num_explored` counts expansions over all
+        iterations and `explored` holds the states of the table.
+        """
+        self._check_reachable()
+        self.num_explored = 0
+        self.explored = set()
+        self.solution = self._ida_star(max_states, max_expansions=max_expansions)
+
+    def _ida_star(self, max_states, threshold=None, max_expansions=None):
+        """Runs IDA* from the start, with `threshold` as the first f bound; returns (actions, cells)."""
+        if max_expansions is None:
+            max_expansions = IDA_EXPANSIONS_PER_CELL * self.height * self.width
+        budget = None  # Última expansión permitida, fijada cuando la tabla se llena
+        goal = self.goal
+        stats = self.stats
+        on_expand = self.on_expand
+        root = Node(state=self.start, parent=None, action=None, cost=0)
+        if threshold is None:
+            threshold = root.heuristic(goal)
+
+        def children(node):
+            cost = node.cost + 1
+            nodes = [Node(state=state, parent=node, action=action, cost=cost)
+                     for action, state in self.neighbors(node.state)]
+            nodes.sort(key=lambda child: child.heuristic(goal))
+            return iter(nodes)
+
+        best_cost = {}  # Tabla de transposición acotada: estado -> menor g visto en esta iteración
+        while True:
+            best_cost.clear()
+            best_cost[root.state] = 0
+            next_threshold = None
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(root.state)
+            if root.state == goal:
+                return ([], [])
+
+            # Pila de (nodo, hijos pendientes); on_path evita ciclos aunque la tabla esté llena
+            stack = [(root, children(root))]
+            on_path = {root.state}
+            stats.pushes += 1
+            while stack:
+                stats.max_frontier = max(stats.max_frontier, len(stack))
+                node, pending = stack[-1]
+                child = next(pending, None)
+                if child is None:
+                    stack.pop()
+                    on_path.discard(node.state)
+                    stats.pops += 1
+                    continue
+
+                f = child.total_cost(goal)
+                if f > threshold:
+                    if next_threshold is None or f < next_threshold:
+                        next_threshold = f
+                    continue
+                known = best_cost.get(child.state)
+                if child.state in on_path or (known is not None and known <= child.cost):
+                    stats.stale_pops += 1
+                    continue
+                if known is not None or len(best_cost) < max_states:
+                    best_cost[child.state] = child.cost
+                elif budget is None:
+                    budget = self.num_explored + max_expansions
+
+                self.num_explored += 1
+                if budget is not None and self.num_explored > budget:
+                    self.explored = set(best_cost)
+                    raise Exception("memory limit reached")
+                if on_expand is not None:
+                    on_expand(child.state)
+                if child.state == goal:
+                    self.explored = set(best_cost)
+                    started = stats.clock()
+                    actions = []
+                    cells = []
+                    while child.parent is not None:
+                        actions.append(child.action)
+                        cells.append(child.state)
+                        child = child.parent
+                    actions.reverse()
+                    cells.reverse()
+                    stats.record("path", started)
+                    return (actions, cells)
+                stack.append((child, children(child)))
+                on_path.add(child.state)
+                stats.pushes += 1
+
+            if next_threshold is None:
+                self.explored = set(best_cost)
+                raise Exception("no solution")
+            threshold = next_threshold
+
+    @instrumented
+    def solve_jps(self):
+        """Finds a solution to maze using Jump Point Search (A* over jump points), if one exists.
+
+        Straight runs are scanned without touching the heap; only jump points (the goal,
+        cells with forced neighbors, and vertical steps from which a horizontal scan finds
+        one) are pushed. `num_explored` counts expanded jump points and `solution` holds
+        the full cell-by-cell path.
+        """
+        self._check_reachable()
+        height, width = self.height, self.width
+        walls = self.wall_flags()
+        goal = self.goal
+
+        def free(r, c):
+            return 0 <= r < height and 0 <= c < width and not walls[r * width + c]
+
+        def jump_horizontal(r, c, dc):
+            while free(r, c):
+                if (r, c) == goal:
+                    return (r, c)
+                # Vecino forzado: se abre una celda arriba o abajo que estaba tapada en la columna anterior
+                if (free(r - 1, c) and not free(r - 1, c - dc)) or (free(r + 1, c) and not free(r + 1, c - dc)):
+                    return (r, c)
+                c += dc
+            return None
+
+        def jump_vertical(r, c, dr):
+            while free(r, c):
+                if (r, c) == goal:
+                    return (r, c)
+                if (free(r, c - 1) and not free(r - dr, c - 1)) or (free(r, c + 1) and not free(r - dr, c + 1)):
+                    return (r, c)
+                # Al moverse en vertical también es punto de salto si una búsqueda horizontal encuentra uno
+                if jump_horizontal(r, c + 1, 1) or jump_horizontal(r, c - 1, -1):
+                    return (r, c)
+                r += dr
+            return None
+
+        def successors(state, parent):
+            stats.neighbor_calls += 1
+            r, c = state
+            if parent is None:
+                directions = MOVES.values()
+            elif parent[0] == r:
+                dc = 1 if c > parent[1] else -1
+                directions = ((-1, 0), (1, 0), (0, dc))
+            else:
+                dr = 1 if r > parent[0] else -1
+                directions = ((0, -1), (0, 1), (dr, 0))
+            for dr, dc in directions:
+                if dr:
+                    point = jump_vertical(r + dr, c, dr)
+                else:
+                    point = jump_horizontal(r, c + dc, dc)
+                if point is not None:
+                    yield point
+
+        self.num_explored = 0
+        self.explored = set()
+        stats = self.stats
+        on_expand = self.on_expand
+        h = abs(self.start[0] - goal[0]) + abs(self.start[1] - goal[1])
+        frontier = [(h, h, 0, self.start)]
+        pushed = 1
+        best_cost = {self.start: 0}
+        parents = {self.start: None}
+
+        while frontier:
+            stats.max_frontier = max(stats.max_frontier, len(frontier))
+            _, _, _, state = heapq.heappop(frontier)
+            stats.pops += 1
+            if state in self.explored:
+                stats.stale_pops += 1
+                continue
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(state)
+
+            if state == goal:
+                stats.pushes = pushed
+                started = stats.clock()
+                self.solution = self._expand_jumps(parents, state)
+                stats.record("path", started)
+                return
+
+            self.explored.add(state)
+
+            for point in successors(state, parents[state]):
+                cost = best_cost[state] + abs(point[0] - state[0]) + abs(point[1] - state[1])
+                if point not in self.explored and cost < best_cost.get(point, cost + 1):
+                    best_cost[point] = cost
+                    parents[point] = state
+                    h = abs(point[0] - goal[0]) + abs(point[1] - goal[1])
+                    heapq.heappush(frontier, (cost + h, h, pushed, point))
+                    pushed += 1
+
+        stats.pushes = pushed
+        raise Exception("no solution")
+
+    def _expand_jumps(self, parents, state):
+        """Rebuilds the cell-by-cell (actions, cells) path from a chain of jump points."""
+        points = []
+        while state is not None:
+            points.append(state)
+            state = parents[state]
+        points.reverse()
+
+        actions = []
+        cells = []
+        for (r, c), (r2, c2) in zip(points, points[1:]):
+            if r == r2:
+                action, dr, dc = ("right", 0, 1) if c2 > c else ("left", 0, -1)
+            else:
+                action, dr, dc = ("down", 1, 0) if r2 > r else ("up", -1, 0)
+            while (r, c) != (r2, c2):
+                r, c = r + dr, c + dc
+                actions.append(action)
+                cells.append((r, c))
+        return (actions, cells)
+
+    def reduced_graph(self):
+        """Returns the corridor graph of the maze, building it on first use."""
+        if self._graph is not None and (self._graph.start, self._graph.goal) == (self.start, self.goal):
+            return self._graph
+
+        height, width = self.height, self.width
+        size = height * width
+        walls = self.wall_flags()
+
+        def open_moves(cell):
+            col = cell % width
+            for move, neighbor in enumerate((
+                cell - width if cell >= width else -1,
+                cell + width if cell < size - width else -1,
+                cell - 1 if col > 0 else -1,
+                cell + 1 if col < width - 1 else -1,
+            )):
+                if neighbor >= 0 and not walls[neighbor]:
+                    yield move, neighbor
+
+        # Nodos: celdas libres con un número de vecinos distinto de 2, más el inicio y la meta
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        graph = CorridorGraph(width, self.start, self.goal)
+        for cell in range(size):
+            if not walls[cell] and (cell == start or cell == goal or sum(1 for _ in open_moves(cell)) != 2):
+                graph.edges[cell] = []
+
+        # Recorrer cada corredor desde cada nodo hasta llegar al siguiente nodo
+        for node, edges in graph.edges.items():
+            for move, cell in open_moves(node):
+                previous = node
+                cells = array("l", [cell])
+                actions = bytearray([move])
+                while cell not in graph.edges:
+                    move, neighbor = next((m, n) for m, n in open_moves(cell) if n != previous)
+                    previous, cell = cell, neighbor
+                    cells.append(cell)
+                    actions.append(move)
+                if cell != node:
+                    edges.append((cell, len(cells), cells, bytes(actions)))
+
+        self._graph = graph
+        return graph
+
+    @instrumented
+    def solve_reduced(self, method="a_star"):
+        """Finds a solution to maze searching the corridor graph, if one exists.
+
+        `method` is "a_star" or "dijkstra". Corridor lengths are the edge weights, so
+        the path is as short as on the full grid; `num_explored` counts graph nodes.
+        """
+        self._check_reachable()
+        if method not in ("a_star", "dijkstra"):
+            raise Exception(f"unknown method: {method}")
+        graph = self.reduced_graph()
+        width = self.width
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        goal_row, goal_col = self.goal
+
+        def heuristic(node):
+            if method == "dijkstra":
+                return 0
+            row, col = divmod(node, width)
+            return abs(row - goal_row) + abs(col - goal_col)
+
+        self.num_explored = 0
+        self.explored = set()
+        stats = self.stats
+        on_expand = self.on_expand
+        closed = set()
+        h = heuristic(start)
+        frontier = [(h, h, 0, start)]
+        pushed = 1
+        best_cost = {start: 0}
+        parents = {start: None}  # nodo -> (nodo previo, arista usada)
+
+        while frontier:
+            stats.max_frontier = max(stats.max_frontier, len(frontier))
+            _, _, _, node = heapq.heappop(frontier)
+            stats.pops += 1
+            if node in closed:
+                stats.stale_pops += 1
+                continue
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(divmod(node, width))
+
+            if node == goal:
+                stats.pushes = pushed
+                started = stats.clock()
+                edges = []
+                while parents[node] is not None:
+                    node, edge = parents[node]
+                    edges.append(edge)
+                actions = []
+                cells = []
+                for _, _, corridor, moves in reversed(edges):
+                    actions.extend(ACTIONS[move] for move in moves)
+                    cells.extend(divmod(cell, width) for cell in corridor)
+                self.solution = (actions, cells)
+                stats.record("path", started)
+                return
+
+            closed.add(node)
+            self.explored.add(divmod(node, width))
+            stats.neighbor_calls += 1
+
+            for edge in graph.edges[node]:
+                target, length = edge[0], edge[1]
+                cost = best_cost[node] + length
+                if target not in closed and cost < best_cost.get(target, cost + 1):
+                    best_cost[target] = cost
+                    parents[target] = (node, edge)
+                    h = heuristic(target)
+                    heapq.heappush(frontier, (cost + h, h, pushed, target))
+                    pushed += 1
+
+        stats.pushes = pushed
+        raise Exception("no solution")
+
+    def distance_field(self, goal=None):
+        """Returns the DistanceField rooted at `goal` (default: the maze goal), cached LRU."""
+        goal = self.goal if goal is None else tuple(goal)
+        if goal is None:
+            raise Exception("maze has no goal")
+        if goal in self._fields:
+            self._fields.move_to_end(goal)
+            return self._fields[goal]
+
+        height, width = self.height, self.width
+        if not (0 <= goal[0] < height and 0 <= goal[1] < width) or self.walls[goal[0]][goal[1]]:
+            raise Exception("goal must be a free cell")
+        size = height * width
+        walls = self.wall_flags()
+
+        # BFS inversa desde la meta: cada celda guarda la acción que la acerca a la meta
+        distance = array("i", [-1]) * size
+        moves = bytearray(size)
+        origin = goal[0] * width + goal[1]
+        distance[origin] = 0
+        frontier = deque([origin])
+        while frontier:
+            cell = frontier.popleft()
+            step = distance[cell] + 1
+            col = cell % width
+            for move, neighbor in enumerate((
+                cell - width if cell >= width else -1,
+                cell + width if cell < size - width else -1,
+                cell - 1 if col > 0 else -1,
+                cell + 1 if col < width - 1 else -1,
+            )):
+                if neighbor >= 0 and distance[neighbor] < 0 and not walls[neighbor]:
+                    distance[neighbor] = step
+                    moves[neighbor] = move ^ 1  # up <-> down, left <-> right
+                    frontier.append(neighbor)
+
+        field = DistanceField(goal, width, distance, moves)
+        self._fields[goal] = field
+        used = sum(cached.nbytes() for cached in self._fields.values())
+        while used > self.field_cache_bytes and len(self._fields) > 1:
+            used -= self._fields.popitem(last=False)[1].nbytes()
+        return field
+
+    def query(self, start, goal=None):
+        """Returns the (actions, cells) shortest path from `start` to `goal` (default: the maze goal).
+
+        Follows the cached distance field of `goal`, so after the first query for a goal
+        each answer costs O(path length). `self.solution` is left untouched.
+        """
+        goal = self.goal if goal is None else goal
+        if goal is None:
+            raise Exception("maze has no goal")
+        if self.components is not None and not self.reachable(start, goal):
+            raise Exception("no solution")
+        field = self.distance_field(goal)
+        width = self.width
+        cell = start[0] * width + start[1]
+        if not (0 <= start[0] < self.height and 0 <= start[1] < width) or field.distance[cell] < 0:
+            raise Exception("no solution")
+
+        actions = []
+        cells = []
+        for _ in range(field.distance[cell]):
+            move = field.moves[cell]
+            dr, dc = MOVES[ACTIONS[move]]
+            cell += dr * width + dc
+            actions.append(ACTIONS[move])
+            cells.append(divmod(cell, width))
+        return (actions, cells)
+
+    def wall_mask(self):
+        """Returns the walls as a NumPy boolean array of shape (height, width)."""
+        import numpy as np
+        if isinstance(self.walls, BitGrid):
+            packed = np.frombuffer(self.walls.bits, dtype=np.uint8).reshape(self.height, self.walls.row_bytes)
+            return np.unpackbits(packed, axis=1)[:, :self.width].astype(bool)
+        return np.frombuffer(self.wall_flags(), dtype=np.uint8).reshape(self.height, self.width).astype(bool)
+
+    def distance_transform(self, source=None, target=None):
+        """Returns a NumPy int32 array with the BFS distance from `source` (default: start) to every cell.
+
+        Walls and unreachable cells get -1. The wavefront is expanded one whole level at a
+        time with vectorized index shifts (+-1, +-width) over the flattened wall mask; if
+        `target` is given, expansion stops at the level that reaches it. Requires NumPy.
+        """
+        import numpy as np
+        source = self.start if source is None else source
+        height, width = self.height, self.width
+        size = height * width
+
+        # Celdas libres aún no alcanzadas por el frente de onda
+        open_cells = ~self.wall_mask().ravel()
+        distance = np.full(size, -1, dtype=np.int32)
+        origin = source[0] * width + source[1]
+        if not open_cells[origin]:
+            return distance.reshape(height, width)
+        target = -1 if target is None else target[0] * width + target[1]
+
+        frontier = np.array([origin], dtype=np.int64)
+        distance[origin] = 0
+        open_cells[origin] = False
+        level = 0
+        while frontier.size and not (target >= 0 and distance[target] >= 0):
+            level += 1
+            cols = frontier % width
+            neighbors = np.concatenate((
+                frontier[frontier >= width] - width,
+                frontier[frontier < size - width] + width,
+                frontier[cols > 0] - 1,
+                frontier[cols < width - 1] + 1,
+            ))
+            frontier = np.unique(neighbors[open_cells[neighbors]])
+            open_cells[frontier] = False
+            distance[frontier] = level
+        return distance.reshape(height, width)
+
+    @instrumented
+    def solve_wavefront(self):
+        """Finds a solution to maze with the NumPy wavefront BFS, if one exists.
+
+        `num_explored` counts the cells closer to the start than the goal, plus the goal.
+        """
+        self._check_reachable()
+        distance = self.distance_transform(target=self.goal)
+        height, width = self.height, self.width
+        goal_distance = int(distance[self.goal])
+        self._layer_stats(distance, goal_distance)
+        if goal_distance < 0:
+            self.num_explored = int((distance >= 0).sum())
+            self.explored = CellSet(bytearray((distance >= 0).astype("uint8").tobytes()), width, 1)
+            raise Exception("no solution")
+
+        reached = (distance >= 0) & (distance < goal_distance)
+        self.num_explored = int(reached.sum()) + 1
+        self.explored = CellSet(bytearray(reached.astype("uint8").tobytes()), width, 1)
+
+        # Reconstruir el camino desde la meta bajando un nivel de distancia en cada paso
+        started = self.stats.clock()
+        actions = []
+        cells = []
+        r, c = self.goal
+        for step in range(goal_distance - 1, -1, -1):
+            cells.append((r, c))
+            for action, (dr, dc) in MOVES.items():
+                pr, pc = r - dr, c - dc
+                if 0 <= pr < height and 0 <= pc < width and distance[pr, pc] == step:
+                    actions.append(action)
+                    r, c = pr, pc
+                    break
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+        self.stats.record("path", started)
+
+    def _layer_stats(self, distance, goal_distance):
+        """Fills Maze.stats for a search that expands whole BFS layers, from its distance array.
+
+        Each layer counts as one neighbor call; every reached cell is one push, and cells
+        before the goal layer (or all of them when the goal was not reached) are pops.
+        """
+        import numpy as np
+        sizes = np.bincount(distance[distance >= 0].ravel())
+        stats = self.stats
+        stats.pushes = int(sizes.sum())
+        stats.pops = int(sizes[:goal_distance].sum()) if goal_distance >= 0 else stats.pushes
+        stats.max_frontier = int(sizes.max())
+        stats.neighbor_calls = goal_distance if goal_distance >= 0 else len(sizes)
+
+    def bitboard(self):
+        """Returns (open_mask, stride): free cells as bits of one int, cell (i, j) at bit i * stride + j.
+
+        `stride` is width + 1, so every row ends in a zero bit and shifting by one
+        never wraps from one row into the next.
+        """
+        width = self.width
+        stride = width + 1
+        cells = self.wall_flags().translate(OPEN_BITS).decode("ascii")
+        # int(..., 2) lee primero el bit más significativo: filas de abajo hacia arriba, cada una invertida
+        rows = ["0" + cells[i * width:(i + 1) * width][::-1] for i in range(self.height - 1, -1, -1)]
+        return int("".join(rows) or "0", 2), stride
+
+    def _bitboard_cells(self, mask, stride):
+        """Turns a bitboard into a CellSet over the maze cells."""
+        bits = format(mask, "b")[::-1].ljust(self.height * stride, "0")
+        rows = "".join(bits[i * stride:i * stride + self.width] for i in range(self.height))
+        return CellSet(bytearray(rows.encode("ascii").translate(UNPACK_BITS)), self.width, 1)
+
+    @instrumented
+    def solve_bitboard(self):
+        """Finds a solution to maze with bit-parallel BFS over big-integer bitboards, if one exists.
+
+        Each BFS layer is computed for the whole maze at once with shifts, AND and OR on
+        Python ints. Only every ~sqrt(depth)-th layer is kept; the path is recovered by
+        walking back from the goal and recomputing the layers of one segment at a time.
+        `num_explored` counts the cells closer to the start than the goal, plus the goal.
+        """
+        self._check_reachable()
+        open_mask, stride = self.bitboard()
+        height, width = self.height, self.width
+        start = self.start[0] * stride + self.start[1]
+        goal_bit = 1 << (self.goal[0] * stride + self.goal[1])
+
+        def expand(visited, frontier):
+            grown = (frontier << 1) | (frontier >> 1) | (frontier << stride) | (frontier >> stride)
+            frontier = grown & open_mask & ~visited
+            return visited | frontier, frontier
+
+        # Capas de la BFS; se guardan puntos de control (nivel, visitados, frente) cada `spacing` niveles
+        stats = self.stats
+        visited = frontier = 1 << start
+        checkpoints = [(0, visited, frontier)]
+        spacing = 1
+        level = 0
+        stats.max_frontier = 1
+        while not frontier & goal_bit:
+            previous = visited
+            visited, frontier = expand(visited, frontier)
+            stats.neighbor_calls += 1
+            if not frontier:
+                self.num_explored = stats.pushes = stats.pops = visited.bit_count()
+                self.explored = self._bitboard_cells(visited, stride)
+                raise Exception("no solution")
+            stats.max_frontier = max(stats.max_frontier, frontier.bit_count())
+            level += 1
+            if level == spacing * spacing:
+                spacing += 1
+            if level % spacing == 0:
+                checkpoints.append((level, visited, frontier))
+
+        self.num_explored = previous.bit_count() + 1
+        self.explored = self._bitboard_cells(previous, stride)
+        stats.pushes = visited.bit_count()
+        stats.pops = previous.bit_count()
+
+        # Caminar hacia atrás desde la meta, recalculando las capas de cada tramo entre puntos de control
+        started = stats.clock()
+        actions = []
+        cells = []
+        r, c = self.goal
+        while level > 0:
+            base, visited, frontier = next(cp for cp in reversed(checkpoints) if cp[0] < level)
+            layers = [frontier]
+            for _ in range(base + 1, level):
+                visited, frontier = expand(visited, frontier)
+                layers.append(frontier)
+            for layer in reversed(layers):
+                cells.append((r, c))
+                for action, (dr, dc) in MOVES.items():
+                    pr, pc = r - dr, c - dc
+                    if 0 <= pr < height and 0 <= pc < width and layer >> (pr * stride + pc) & 1:
+                        actions.append(action)
+                        r, c = pr, pc
+                        break
+            level = base
+        actions.reverse()
+        cells.reverse()
+        self.solution = (actions, cells)
+        stats.record("path", started)
+
+    @instrumented
+    def solve_bidirectional(self):
+        """Finds a solution to maze using BFS from both start and goal, if one exists.
+
+        Expands the smaller of the two frontiers one whole layer at a time and stops
+        after the first layer where the searches meet, keeping the shortest joint path.
+        `num_explored` and `explored` cover the states expanded on both sides.
+        """
+        self._check_reachable()
+        self.num_explored = 0
+        self.explored = set()
+
+        # estado -> (estado previo, acción, profundidad); hacia atrás la acción apunta a la meta
+        forward = {self.start: (None, None, 0)}
+        backward = {self.goal: (None, None, 0)}
+        forward_layer = [self.start]
+        backward_layer = [self.goal]
+        stats = self.stats
+        stats.pushes = 2
+        on_expand = self.on_expand
+
+        while forward_layer and backward_layer:
+            stats.max_frontier = max(stats.max_frontier, len(forward_layer) + len(backward_layer))
+            from_start = len(forward_layer) <= len(backward_layer)
+            if from_start:
+                layer, parents, other = forward_layer, forward, backward
+            else:
+                layer, parents, other = backward_layer, backward, forward
+
+            next_layer = []
+            meeting = None
+            for state in layer:
+                self.num_explored += 1
+                self.explored.add(state)
+                if on_expand is not None:
+                    on_expand(state)
+                depth = parents[state][2] + 1
+                for action, neighbor in self.neighbors(state):
+                    if neighbor in parents:
+                        continue
+                    parents[neighbor] = (state, action if from_start else OPPOSITE[action], depth)
+                    next_layer.append(neighbor)
+                    stats.pushes += 1
+                    if neighbor in other and (meeting is None or other[neighbor][2] < other[meeting][2]):
+                        meeting = neighbor
+
+            if meeting is not None:
+                stats.pops = self.num_explored
+                started = stats.clock()
+                self.solution = self._join_paths(forward, backward, meeting)
+                stats.record("path", started)
+                return
+
+            if from_start:
+                forward_layer = next_layer
+            else:
+                backward_layer = next_layer
+
+        stats.pops = self.num_explored
+        raise Exception("no solution")
+
+    def _join_paths(self, forward, backward, meeting):
+        """Builds (actions, cells) from the two parent maps of a bidirectional search."""
+        actions = []
+        cells = []
+        state = meeting
+        while forward[state][0] is not None:
+            parent, action = forward[state][:2]
+            actions.append(action)
+            cells.append(state)
+            state = parent
+        actions.reverse()
+        cells.reverse()
+
+        state = meeting
+        while backward[state][0] is not None:
+            state, action = backward[state][:2]
+            actions.append(action)
+            cells.append(state)
+        return (actions, cells)
+
+    @instrumented
+    def solve_weighted(self, method="dijkstra", queue="buckets"):
+        """Finds a cheapest solution to maze with terrain costs, if one exists.
+
+        Entering a cell costs its digit 1-9 in the maze file, or 1 for ' ', 'A' and 'B'
+        (every cell costs 1 if the file has no digits); the other solvers ignore costs.
+        The total is stored in `solution_cost`. `method` is "dijkstra" or "a_star", whose
+        Manhattan heuristic stays admissible because every step costs at least 1.
+
+        With queue="buckets" the frontier is Dial's bucket queue: pending priorities are
+        never more than the largest cost + 1 above the one being expanded, so a ring of
+        that many lists indexed by priority gives O(1) push and pop. queue="heap" runs the
+        same search on heapq.
+        """
+        self._check_reachable()
+        if method not in ("dijkstra", "a_star"):
+            raise Exception(f"unknown method: {method}")
+        if queue not in ("buckets", "heap"):
+            raise Exception(f"unknown queue: {queue}")
+        width = self.width
+        size = self.height * width
+        walls = self.wall_flags()
+        costs = self.costs if self.costs is not None else bytearray(b"\x01") * size
+        start = self.start[0] * width + self.start[1]
+        goal = self.goal[0] * width + self.goal[1]
+        goal_row, goal_col = self.goal
+        a_star = method == "a_star"
+        buckets = queue == "buckets"
+
+        # Costo g, celdas cerradas, padre y acción de cada celda, indexados por i * width + j
+        g = array("l", [-1]) * size
+        closed = bytearray(size)
+        parent = array("l", [-1]) * size
+        action = bytearray(size)
+        g[start] = 0
+        current = abs(self.start[0] - goal_row) + abs(self.start[1] - goal_col) if a_star else 0
+        ring = max(costs) + 2
+        frontier = [[] for _ in range(ring)] if buckets else []
+        if buckets:
+            frontier[current % ring].append(start)
+        else:
+            frontier.append((current, 0, start))
+        pending = pushed = 1
+
+        self.num_explored = 0
+        self.explored = CellSet(closed, width, 1)
+        self.solution_cost = None
+        stats = self.stats
+        on_expand = self.on_expand
+
+        while pending:
+            if buckets:
+                bucket = frontier[current % ring]
+                if not bucket:
+                    current += 1
+                    continue
+                cell = bucket.pop()
+            else:
+                cell = heapq.heappop(frontier)[2]
+            stats.max_frontier = max(stats.max_frontier, pending)
+            pending -= 1
+            stats.pops += 1
+            if closed[cell]:
+                stats.stale_pops += 1
+                continue
+            closed[cell] = 1
+            self.num_explored += 1
+            if on_expand is not None:
+                on_expand(divmod(cell, width))
+
+            if cell == goal:
+                stats.pushes = pushed
+                started = stats.clock()
+                self.solution = self._flat_path(parent, action, start, goal)
+                self.solution_cost = g[goal]
+                stats.record("path", started)
+                return
+
+            stats.neighbor_calls += 1
+            base = g[cell]
+            col = cell % width
+            for move, neighbor in enumerate((
+                cell - width if cell >= width else -1,
+                cell + width if cell < size - width else -1,
+                cell - 1 if col > 0 else -1,
+                cell + 1 if col < width - 1 else -1,
+            )):
+                if neighbor < 0 or walls[neighbor] or closed[neighbor]:
+                    continue
+                cost = base + costs[neighbor]
+                if 0 <= g[neighbor] <= cost:
+                    continue
+                g[neighbor] = cost
+                parent[neighbor] = cell
+                action[neighbor] = move
+                if a_star:
+                    r, c = divmod(neighbor, width)
+                    cost += abs(r - goal_row) + abs(c - goal_col)
+                if buckets:
+                    frontier[cost % ring].append(neighbor)
+                else:
+                    heapq.heappush(frontier, (cost, pushed, neighbor))
+                pushed += 1
+                pending += 1
+
+        stats.pushes = pushed
+        raise Exception("no solution")
+
+    def set_wall(self, cell, wall):
+        """Opens or closes `cell`, dropping the indexes built from the old walls.
+
+        A planner left by `solve_incremental` is updated in place, so the next call repairs
+        the previous search instead of starting over.
+        """
+        i, j = cell
+        if not (0 <= i < self.height and 0 <= j < self.width):
+            raise Exception("cell outside the maze")
+        if wall and cell in (self.start, self.goal):
+            raise Exception("start and goal must be free cells")
+        if isinstance(self.walls, BitGrid):
+            if isinstance(self.walls.bits, memoryview) and self.walls.bits.readonly:
+                raise Exception("walls are read-only, load the maze with copy=True")
+            self.walls.set_wall(i, j, wall)
+        else:
+            self.walls[i][j] = bool(wall)
+        self.solution = None
+        self._graph = None
+        self.components = None
+        self._fields.clear()
+        if self._planner is not None:
+            self._planner.set_wall(i * self.width + j, 1 if wall else 0)
+
+    def move_start(self, cell):
+        """Moves the start to the free cell `cell`, keeping the planner of `solve_incremental`."""
+        i, j = cell
+        if not (0 <= i < self.height and 0 <= j < self.width) or self.walls[i][j]:
+            raise Exception("start must be a free cell")
+        self.start = (i, j)
+        self.solution = None
+        if self._planner is not None:
+            self._planner.move_start(i * self.width + j)
+
+    @instrumented
+    def solve_incremental(self):
+        """Finds a solution to maze using D* Lite, if one exists.
+
+        The first call is a full search from the goal; after `set_wall` or `move_start`
+        the next call repairs it, and `num_explored` and `explored` only cover the cells
+        expanded by that repair.
+        """
+        self._check_reachable()
+        planner = self._planner
+        if planner is None or planner.goal != self.goal[0] * self.width + self.goal[1]:
+            planner = self._planner = DStarLite(self.wall_flags(), self.height, self.width, self.start, self.goal)
+        expanded = planner.compute(self.stats, self.on_expand)
+        self.num_explored = len(expanded)
+        self.explored = {divmod(cell, self.width) for cell in expanded}
+
+        started = self.stats.clock()
+        solution = planner.path()
+        self.stats.record("path", started)
+        if solution is None:
+            raise Exception("no solution")
+        self.solution = solution
+
+    def output_image(self, filename, show_solution=True, show_explored=False, cell_size=50, cell_border=2):
+        """Saves the maze as an image, `cell_size` pixels per cell with a black `cell_border`.
+
+        Builds one palette index per cell and scales it up with nearest-neighbor
+        resampling, so the cost does not depend on the length of the solution.
+        """
+        from PIL import Image
+
+        started = self.stats.clock()
+        # Índices de paleta por celda, aplicados de menor a mayor prioridad
+        flags = self.wall_flags()
+        pixels = flags.translate(CELL_COLORS)
+        width = self.width
+        solution = self.solution[1] if self.solution is not None else None
+        explored = self.explored
+        if solution is not None and show_explored and isinstance(explored, CellSet):
+            # Mezcla de ambos arreglos en una sola pasada: cada byte vale a lo sumo 3, sin acarreos
+            seen = explored.flags.translate(bytes(b == explored.value for b in range(256)))
+            key = 2 * int.from_bytes(flags, "big") + int.from_bytes(seen, "big")
+            pixels = bytearray(key.to_bytes(len(flags), "big").translate(EXPLORED_CELL_COLORS))
+        elif solution is not None and show_explored:
+            for i, j in explored:
+                if not flags[i * width + j]:
+                    pixels[i * width + j] = EXPLORED_COLOR
+        if solution is not None and show_solution:
+            for i, j in solution:
+                if not flags[i * width + j]:
+                    pixels[i * width + j] = SOLUTION_COLOR
+        for state, color in ((self.goal, GOAL_COLOR), (self.start, START_COLOR)):
+            if state is not None and not flags[state[0] * width + state[1]]:
+                pixels[state[0] * width + state[1]] = color
+
+        img = Image.frombytes("P", (width, self.height), bytes(pixels))
+        img.putpalette(PALETTE)
+        img = img.resize((width * cell_size, self.height * cell_size), Image.NEAREST)
+
+        # Si el borde no deja sitio al color de la celda, se reduce hasta que quepa
+        cell_border = min(cell_border, cell_size // 2)
+        # Bordes negros: en cada celda solo es color el rango [cell_border, cell_size - cell_border]
+        if cell_border > 0:
+            edge = bytes(255 if x < cell_border or x > cell_size - cell_border else 0 for x in range(cell_size))
+            inner_row = edge * width
+            border_row = b"\xff" * len(inner_row)
+            block = b"".join(inner_row if edge[y] == 0 else border_row for y in range(cell_size))
+            mask = Image.frombytes("L", img.size, block * self.height)
+            img.paste(BORDER_COLOR, mask=mask)
+
+        img.save(filename)
+        self.stats.record("render", started)
 
 def main():
     while True:
@@ -227,9 +1989,10 @@ def main():
         print("1. DFS (Depth-First Search)")
         print("2. BFS (Breadth-First Search)")
         print("3. A* (A Star)")
-        print("4. Salir")
+        print("4. BFS bidireccional")
+        print("5. Salir")
 
-        choice = input("Seleccione una opción (1-4): ")
+        choice = input("Seleccione una opción (1-5): ")
 
         if choice == '1':
             filename = input("Ingrese el nombre del archivo del laberinto (ej. maze.txt): ")
@@ -265,6 +2028,17 @@ def main():
             m.print()
 
         elif choice == '4':
+            filename = input("Ingrese el nombre del archivo del laberinto (ej. maze.txt): ")
+            m = Maze(filename)
+            print("Maze:")
+            m.print()
+            print("Resolviendo con BFS bidireccional...")
+            m.solve_bidirectional()
+            print("Estados explorados:", m.num_explored)
+            print("Solución:")
+            m.print()
+
+        elif choice == '5':
             print("Saliendo del programa.")
             break
 